@@ -1,17 +1,203 @@
 #!/usr/bin/env python3
+import io
 import os
+import sys
+import time
 import random
 import heapq
+import atexit
+import pstats
+import asyncio
+import cProfile
+import argparse
+import functools
 import threading
+import multiprocessing
+import concurrent.futures
+import itertools
+import tracemalloc
 import tkinter as tk
-from tkinter import PhotoImage, Canvas, Button, Label, messagebox, ttk
+from tkinter import PhotoImage, Canvas, Button, Label, messagebox, simpledialog, ttk
 from tkinter.font import Font
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 
+try:
+    import numpy as np
+except ImportError:  # NumPy n'est nécessaire que pour le moteur vectorisé (BatchBoards)
+    np = None
+
 # Variable globale pour l'image source
 image_source_path = "shuffle/image1.png"
 
-def load_image_and_create_tiles(size):
+PROFILE_REPORT_PATH = "profil_taquin.txt"
+
+class Profiler:
+    """
+    Profilage optionnel, activé par la variable d'environnement TAQUIN_PROFIL ou l'option --profil.
+    Options séparées par des virgules :
+      1           temps des fonctions instrumentées et retard de la boucle Tk
+      cprofile    cProfile autour de chaque résolution A*
+      tracemalloc pic mémoire de chaque résolution A*
+    Une valeur vide, 0 ou false laisse le profilage désactivé.
+    Désactivé, chaque point de mesure ne coûte qu'un test sur `enabled`.
+    Le rapport est écrit dans PROFILE_REPORT_PATH à la fermeture de l'application.
+    """
+    LAG_INTERVAL_MS = 100
+
+    def __init__(self):
+        self.enabled = False
+        self.options = set()
+        self.stats = {}  # nom -> [appels, total (s), max (s)]
+        self.lock = threading.Lock()
+        self.active_solves = 0
+        self.cprofile_lock = threading.Lock()  # un seul cProfile actif à la fois
+        self.cprofile_stats = None
+        self.solve_peaks = []
+
+    def enable(self, options):
+        self.enabled = True
+        self.options = {option.strip() for option in options.split(",")}
+        if "tracemalloc" in self.options:
+            tracemalloc.start()
+        atexit.register(self.write_report)
+
+    def record(self, name, seconds):
+        with self.lock:
+            entry = self.stats.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def timed(self, name):
+        """Décorateur : mesure chaque appel de la fonction sous le nom `name`."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def solve(self, func):
+        """
+        Décorateur des solveurs : temps de résolution et, selon les options, cProfile et
+        pic mémoire tracemalloc. Le nombre de résolutions en cours sert à distinguer le
+        retard de la boucle Tk dû au solveur (GIL) du retard au repos.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            with self.lock:
+                self.active_solves += 1
+            profile = None
+            if "cprofile" in self.options and self.cprofile_lock.acquire(blocking=False):
+                profile = cProfile.Profile()
+                profile.enable()
+            if "tracemalloc" in self.options:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(func.__name__, time.perf_counter() - start)
+                if profile is not None:
+                    profile.disable()
+                    with self.lock:
+                        if self.cprofile_stats is None:
+                            self.cprofile_stats = pstats.Stats(profile)
+                        else:
+                            self.cprofile_stats.add(profile)
+                    self.cprofile_lock.release()
+                if "tracemalloc" in self.options:
+                    peak = tracemalloc.get_traced_memory()[1] - base
+                    with self.lock:
+                        self.solve_peaks.append(peak)
+                with self.lock:
+                    self.active_solves -= 1
+        return wrapper
+
+    def start_lag_monitor(self, root):
+        """
+        Mesure le retard de la boucle Tk : un rappel `after` est programmé toutes les
+        LAG_INTERVAL_MS ms et on enregistre de combien il se déclenche en retard.
+        """
+        if not self.enabled:
+            return
+
+        def tick(expected):
+            late = max(0.0, time.perf_counter() - expected)
+            name = "boucle Tk : retard (solveur actif)" if self.active_solves else "boucle Tk : retard (au repos)"
+            self.record(name, late)
+            schedule()
+
+        def schedule():
+            root.after(self.LAG_INTERVAL_MS, tick, time.perf_counter() + self.LAG_INTERVAL_MS / 1000)
+
+        schedule()
+
+    def write_report(self, path=PROFILE_REPORT_PATH):
+        lines = ["Rapport de profilage du Jeu du Taquin", ""]
+        lines.append(f"{'mesure':<40} {'appels':>8} {'total ms':>10} {'moy. ms':>9} {'max ms':>9}")
+        with self.lock:
+            stats = sorted(self.stats.items(), key=lambda item: -item[1][1])
+            peaks = list(self.solve_peaks)
+        for name, (count, total, longest) in stats:
+            lines.append(f"{name:<40} {count:>8} {total*1000:>10.1f} {total*1000/count:>9.2f} {longest*1000:>9.2f}")
+
+        if peaks:
+            lines += ["", f"Pic mémoire des résolutions (tracemalloc) : max {max(peaks)//1024} Ko, "
+                          f"moyenne {sum(peaks)//len(peaks)//1024} Ko sur {len(peaks)} résolutions"]
+        if self.cprofile_stats is not None:
+            stream = io.StringIO()
+            self.cprofile_stats.stream = stream
+            self.cprofile_stats.sort_stats("cumulative").print_stats(25)
+            lines += ["", "cProfile des résolutions (25 fonctions les plus coûteuses) :", stream.getvalue()]
+
+        report = "\n".join(lines)
+        try:
+            with open(path, "w", encoding="utf-8") as report_file:
+                report_file.write(report + "\n")
+            print("Rapport de profilage écrit dans", path)
+        except OSError as e:
+            print("Erreur lors de l'écriture du rapport de profilage :", e)
+            print(report)
+
+profiler = Profiler()
+
+# Taille des tuiles en pixels : recalculée selon la place disponible dans la fenêtre
+DEFAULT_TILE_SIZE = 150
+MIN_TILE_SIZE = 40
+MIN_MULTI_TILE_SIZE = 20  # plancher des écrans à plusieurs plateaux (jusqu'à 8 en 800x600)
+MAX_TILE_SIZE = 200
+TILE_CACHE_MAX = 8  # nombre de jeux de tuiles redimensionnés gardés en mémoire
+RESIZE_DEBOUNCE_MS = 200
+tile_size = DEFAULT_TILE_SIZE
+tile_cache = {}
+
+def load_image_and_create_tiles(size, tile_px=DEFAULT_TILE_SIZE):
+    """
+    Retourne le jeu de tuiles pour un puzzle `size`x`size` de tuiles de `tile_px` pixels.
+    Les jeux déjà calculés sont conservés dans `tile_cache` (par image, taille et pixels)
+    pour que des redimensionnements répétés ne refassent pas le travail de LANCZOS.
+    """
+    key = (image_source_path, size, tile_px)
+    if key in tile_cache:
+        return tile_cache[key]
+    photos = create_tiles(size, tile_px)
+    if len(tile_cache) >= TILE_CACHE_MAX:
+        tile_cache.pop(next(iter(tile_cache)))  # le plus ancien
+    tile_cache[key] = photos
+    return photos
+
+@profiler.timed("create_tiles (Pillow)")
+def create_tiles(size, tile_px):
     """
     Découpe une image source en tuiles dynamiques et ajoute les numéros sur chaque tuile.
     Retourne une liste `photos` où photos[0] == None (tuile vide) et photos[1..n] sont ImageTk.PhotoImage.
@@ -32,7 +218,7 @@ def load_image_and_create_tiles(size):
         image_source = Image.open(image_source_path)
 
         # Redimensionner l'image pour correspondre aux dimensions du puzzle
-        total_size = size * 150  # 150 pixels par tuile
+        total_size = size * tile_px
         image_source = image_source.resize((total_size, total_size), resample=resample_filter)
 
         # Calculer la taille de chaque tuile
@@ -86,7 +272,7 @@ def load_image_and_create_tiles(size):
         print("Erreur lors du découpage des images ou de l'ajout des chiffres :", e)
         # fallback : créer des tuiles colorées numérotées (au cas où l'image est manquante)
         photos = [None]  # index 0 = tuile vide
-        tile_width = tile_height = 150
+        tile_width = tile_height = tile_px
         font_size = max(12, tile_width // 3)
         try:
             font = ImageFont.truetype("arial.ttf", font_size)
@@ -181,20 +367,31 @@ def choisir_image_aleatoire():
     if images:
         image_source_path = os.path.join(image_folder, random.choice(images))
 
-def animate_tile(canvas, tile, start_x, start_y, end_x, end_y, steps=10, delay=20):
+def animate_tile(canvas, tile, start_x, start_y, end_x, end_y, steps=10, delay=20, on_done=None):
     """
     Anime le déplacement d'une tuile dans le canvas.
+    Appelle `on_done` (s'il est fourni) une fois la tuile arrivée.
     """
     delta_x = (end_x - start_x) / steps
     delta_y = (end_y - start_y) / steps
+    start_time = time.perf_counter()
 
-    def step_animation(step=0):
-        if step <= steps:
+    def step_animation(step=0, expected=None):
+        if expected is not None:
+            # profilage : retard de ce pas de la chaîne d'`after`
+            profiler.record("animate_tile : retard des pas", max(0.0, time.perf_counter() - expected))
+        if step < steps:
             try:
                 canvas.move(tile, delta_x, delta_y)
             except Exception:
                 pass
-            canvas.after(delay, step_animation, step + 1)
+            expected = time.perf_counter() + delay / 1000 if profiler.enabled else None
+            canvas.after(delay, step_animation, step + 1, expected)
+        else:
+            if profiler.enabled:
+                profiler.record("animate_tile : durée totale", time.perf_counter() - start_time)
+            if on_done is not None:
+                on_done()
 
     step_animation()
 
@@ -204,17 +401,20 @@ goal_state_4x4 = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 0]]
 
 # Variables globales
 mode_de_jeu = None
-fenetre_joueur1 = None
-fenetre_joueur2 = None
-puzzle_canvas_j1 = None
-puzzle_canvas_j2 = None
+nombre_joueurs = 2
 photos = []
 board_j1 = None
-board_j2 = None
-current_player = 1
 shuffle_button = None
-shuffle_button_j1 = None
-shuffle_button_j2 = None
+multiplayer_game = None
+resize_handler = None  # adapte l'écran de jeu courant à la taille de la fenêtre
+resize_after_id = None
+solution_player = None
+current_recording = None  # partie solo / IA en cours d'enregistrement
+network_game = None
+race_game = None
+race_difficulty = "Moyen"
+metrics_panel = None  # panneau des mesures du solveur (mode IA)
+playback_delay = 300  # délai entre deux coups lors de la lecture d'une solution (ms)
 
 def setup_window(window, title):
     window.title(title)
@@ -226,6 +426,7 @@ def setup_window(window, title):
     x = (screen_width - window_width) // 2
     y = (screen_height - window_height) // 2
     window.geometry(f'{window_width}x{window_height}+{x}+{y}')
+    window.minsize(400, 400)
 
 def create_title_label(parent, text):
     return Label(
@@ -247,6 +448,7 @@ def afficher_page_accueil():
     frame.pack(expand=True)
 
     StyledButton(frame, text="Jouer", command=afficher_selection_mode).pack(pady=10)
+    StyledButton(frame, text="Revoir la dernière partie", command=revoir_derniere_partie).pack(pady=10)
     StyledButton(frame, text="Quitter", command=fenetre.quit).pack(pady=10)
 
 def afficher_selection_mode():
@@ -269,6 +471,8 @@ def afficher_selection_mode():
     StyledButton(frame, text="Solo", command=lambda: choisir_mode("solo")).pack(pady=10)
     StyledButton(frame, text="IA", command=lambda: choisir_mode("ia")).pack(pady=10)
     StyledButton(frame, text="Multijoueur", command=lambda: choisir_mode("multijoueur")).pack(pady=10)
+    StyledButton(frame, text="En ligne", command=lambda: choisir_mode("en_ligne")).pack(pady=10)
+    StyledButton(frame, text="Course contre l'IA", command=lambda: choisir_mode("course")).pack(pady=10)
 
 def choisir_mode(mode):
     global mode_de_jeu
@@ -292,42 +496,120 @@ def afficher_selection_taille():
         fg=COLORS['text']
     ).pack(pady=20)
 
-    StyledButton(frame, text="3x3", command=lambda: start_game(3)).pack(pady=10)
-    StyledButton(frame, text="4x4", command=lambda: start_game(4)).pack(pady=10)
+    if mode_de_jeu in ("multijoueur", "en_ligne"):
+        StyledButton(frame, text="3x3", command=lambda: afficher_selection_joueurs(3)).pack(pady=10)
+        StyledButton(frame, text="4x4", command=lambda: afficher_selection_joueurs(4)).pack(pady=10)
+    elif mode_de_jeu == "course":
+        StyledButton(frame, text="3x3", command=lambda: afficher_selection_difficulte(3)).pack(pady=10)
+        StyledButton(frame, text="4x4", command=lambda: afficher_selection_difficulte(4)).pack(pady=10)
+    else:
+        StyledButton(frame, text="3x3", command=lambda: start_game(3)).pack(pady=10)
+        StyledButton(frame, text="4x4", command=lambda: start_game(4)).pack(pady=10)
 
     # Bouton Retour
     StyledButton(frame, text="Retour", command=afficher_selection_mode).pack(pady=10)
 
+def afficher_selection_joueurs(size):
+    for widget in fenetre.winfo_children():
+        widget.destroy()
+
+    create_title_label(fenetre, "Nombre de joueurs").pack()
+
+    frame = tk.Frame(fenetre, bg=COLORS['background'], pady=20)
+    frame.pack(expand=True)
+
+    Label(
+        frame,
+        text="Choisissez le nombre de joueurs",
+        font=('Helvetica', 16),
+        bg=COLORS['background'],
+        fg=COLORS['text']
+    ).pack(pady=20)
+
+    button_frame = tk.Frame(frame, bg=COLORS['background'])
+    button_frame.pack(pady=10)
+    for n in (2, 3, 4, 6, 8):
+        StyledButton(button_frame, text=str(n), command=lambda n=n: choisir_nombre_joueurs(size, n)).pack(side='left', padx=5)
+
+    # Bouton Retour
+    StyledButton(frame, text="Retour", command=afficher_selection_taille).pack(pady=10)
+
+def choisir_nombre_joueurs(size, n):
+    global nombre_joueurs
+    nombre_joueurs = n
+    start_game(size)
+
+def afficher_selection_difficulte(size):
+    for widget in fenetre.winfo_children():
+        widget.destroy()
+
+    create_title_label(fenetre, "Difficulté").pack()
+
+    frame = tk.Frame(fenetre, bg=COLORS['background'], pady=20)
+    frame.pack(expand=True)
+
+    Label(
+        frame,
+        text="Choisissez la difficulté de l'IA",
+        font=('Helvetica', 16),
+        bg=COLORS['background'],
+        fg=COLORS['text']
+    ).pack(pady=20)
+
+    for name in RACE_BUDGETS:
+        StyledButton(frame, text=name, command=lambda name=name: choisir_difficulte(size, name)).pack(pady=10)
+
+    # Bouton Retour
+    StyledButton(frame, text="Retour", command=afficher_selection_taille).pack(pady=10)
+
+def choisir_difficulte(size, name):
+    global race_difficulty
+    race_difficulty = name
+    start_game(size)
+
 def start_game(size):
-    global board_j1, board_j2, goal_state, photos, puzzle_canvas, shuffle_button, random_image_button
+    global board_j1, goal_state, puzzle_canvas, shuffle_button, random_image_button, current_recording, metrics_panel
+    if current_recording is not None:
+        current_recording.end(False)
+        current_recording = None
     if size == 3:
         board_j1 = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
-        board_j2 = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
         goal_state = goal_state_3x3
     else:
         board_j1 = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 0]]
-        board_j2 = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 0]]
         goal_state = goal_state_4x4
 
-    photos = load_image_and_create_tiles(size)
     for widget in fenetre.winfo_children():
         widget.destroy()
 
     if mode_de_jeu == "multijoueur":
-        start_multiplayer_game(size)
+        start_multiplayer_game(size, nombre_joueurs)
+    elif mode_de_jeu == "en_ligne":
+        start_network_game(size, nombre_joueurs)
+    elif mode_de_jeu == "course":
+        start_race_game(size, race_difficulty)
     else:
         game_frame = tk.Frame(fenetre, bg=COLORS['background'])
         game_frame.pack(expand=True)
 
+        board_frame = tk.Frame(game_frame, bg=COLORS['background'])
+        board_frame.pack(pady=20)
+
         puzzle_canvas = Canvas(
-            game_frame,
-            width=size*150,
-            height=size*150,
+            board_frame,
+            width=size*tile_size,
+            height=size*tile_size,
             bg=COLORS['white'],
             highlightthickness=2,
             highlightbackground=COLORS['primary']
         )
-        puzzle_canvas.pack(pady=20)
+        puzzle_canvas.pack(side='left')
+
+        # Panneau des mesures du solveur à côté du plateau
+        metrics_panel = None
+        if mode_de_jeu == "ia":
+            metrics_panel = MetricsPanel(board_frame)
+            metrics_panel.pack(side='left', padx=20)
 
         button_frame = tk.Frame(game_frame, bg=COLORS['background'])
         button_frame.pack(pady=20)
@@ -335,21 +617,49 @@ def start_game(size):
         if mode_de_jeu == "solo":
             puzzle_canvas.bind("<Button-1>", lambda e: disable_shuffle_button_and_move(e, board_j1, puzzle_canvas, shuffle_button))
 
-        shuffle_button = StyledButton(button_frame, text="Mélanger", command=shuffle_puzzle)
-        shuffle_button.pack(side='left', padx=10)
+        if mode_de_jeu != "revoir":
+            shuffle_button = StyledButton(button_frame, text="Mélanger", command=shuffle_puzzle)
+            shuffle_button.pack(side='left', padx=10)
 
-        # Bouton pour choisir une image aléatoire
-        random_image_button = StyledButton(button_frame, text="Image Aléatoire", command=lambda: changer_image_et_recharger_puzzle(size))
-        random_image_button.pack(side='left', padx=10)
+            # Bouton pour choisir une image aléatoire
+            random_image_button = StyledButton(button_frame, text="Image Aléatoire", command=lambda: changer_image_et_recharger_puzzle(size))
+            random_image_button.pack(side='left', padx=10)
 
         if mode_de_jeu == "ia":
            StyledButton(button_frame, text="Résolution IA (Manhattan)",
              command=lambda: handle_ia_button(shuffle_button, "manhattan")).pack(side='left', padx=10)
            StyledButton(button_frame, text="Résolution IA (Hamming)",
              command=lambda: handle_ia_button(shuffle_button, "hamming")).pack(side='left', padx=10)
+           StyledButton(button_frame, text="Comparer",
+             command=compare_heuristics).pack(side='left', padx=10)
         StyledButton(button_frame, text="Quitter", command=lambda: quitter_partie()).pack(side='left', padx=10)
 
-        update_display()
+        if mode_de_jeu in ("ia", "revoir"):
+            # Contrôles de lecture de la solution
+            playback_frame = tk.Frame(game_frame, bg=COLORS['background'])
+            playback_frame.pack(pady=10)
+            StyledButton(playback_frame, text="Pause / Reprendre",
+                         command=lambda: control_playback("toggle_pause")).pack(side='left', padx=10)
+            StyledButton(playback_frame, text="Étape",
+                         command=lambda: control_playback("step")).pack(side='left', padx=10)
+            StyledButton(playback_frame, text="Instantané",
+                         command=lambda: control_playback("skip")).pack(side='left', padx=10)
+            speed_scale = tk.Scale(
+                playback_frame,
+                from_=20,
+                to=1000,
+                orient='horizontal',
+                label="Délai entre les coups (ms)",
+                command=set_playback_delay,
+                bg=COLORS['background'],
+                fg=COLORS['text'],
+                highlightthickness=0,
+                length=200
+            )
+            speed_scale.set(playback_delay)
+            speed_scale.pack(side='left', padx=10)
+
+        set_resize_handler(fit_solo_board_to_window)
 
 def handle_ia_button(shuffle_button_ref, heuristic):
     """
@@ -387,11 +697,11 @@ def changer_image_et_recharger_puzzle(size):
     images = [f for f in os.listdir(image_folder) if f.endswith(".png")]
     if images:
         image_source_path = os.path.join(image_folder, random.choice(images))
-        photos = load_image_and_create_tiles(size)  # Recharge les tuiles avec la nouvelle image
+        photos = load_image_and_create_tiles(size, tile_size)  # Recharge les tuiles avec la nouvelle image
         update_display()
 
-def start_multiplayer_game(size):
-    global puzzle_canvas_j1, puzzle_canvas_j2, shuffle_button_j1, shuffle_button_j2, current_player
+def start_multiplayer_game(size, player_count=2):
+    global multiplayer_game
 
     for widget in fenetre.winfo_children():
         widget.destroy()
@@ -401,110 +711,213 @@ def start_multiplayer_game(size):
     game_frame = tk.Frame(fenetre, bg=COLORS['background'])
     game_frame.pack(expand=True, pady=20)
 
-    # Frame Joueur 1
-    frame_j1 = tk.Frame(game_frame, bg=COLORS['background'])
-    frame_j1.pack(side='left', padx=40)
-
-    Label(
-        frame_j1,
-        text="Joueur 1",
-        font=('Helvetica', 16, 'bold'),
-        bg=COLORS['background'],
-        fg=COLORS['text']
-    ).pack()
-
-    puzzle_canvas_j1 = Canvas(
-        frame_j1,
-        width=size*150,
-        height=size*150,
-        bg=COLORS['white'],
-        highlightthickness=2,
-        highlightbackground=COLORS['primary']
-    )
-    puzzle_canvas_j1.pack(pady=10)
-
-    shuffle_button_j1 = StyledButton(frame_j1, text="Mélanger", command=shuffle_puzzle_j1)
-    shuffle_button_j1.pack(pady=5)
-    StyledButton(frame_j1, text="Quitter", command=lambda: quitter_partie(1)).pack(pady=5)
-
-    # Frame Joueur 2
-    frame_j2 = tk.Frame(game_frame, bg=COLORS['background'])
-    frame_j2.pack(side='right', padx=40)
-
-    Label(
-        frame_j2,
-        text="Joueur 2",
-        font=('Helvetica', 16, 'bold'),
-        bg=COLORS['background'],
-        fg=COLORS['text']
-    ).pack()
-
-    puzzle_canvas_j2 = Canvas(
-        frame_j2,
-        width=size*150,
-        height=size*150,
-        bg=COLORS['white'],
-        highlightthickness=2,
-        highlightbackground=COLORS['primary']
-    )
-    puzzle_canvas_j2.pack(pady=10)
-
-    shuffle_button_j2 = StyledButton(frame_j2, text="Mélanger", command=shuffle_puzzle_j2)
-    shuffle_button_j2.pack(pady=5)
-    StyledButton(frame_j2, text="Quitter", command=lambda: quitter_partie(2)).pack(pady=5)
-
-    # Désactiver le plateau du joueur 2 et les boutons au départ
-    disable_canvas(puzzle_canvas_j2)
-    enable_canvas(puzzle_canvas_j1)
-
-    # Lier les clics sur chaque puzzle
-    puzzle_canvas_j1.bind("<Button-1>", move_tile_j1)
-    puzzle_canvas_j2.bind("<Button-1>", move_tile_j2)
-
-    update_display_j1()
-    update_display_j2()
-
-def move_tile_j1(event):
-    global board_j1, current_player, shuffle_button_j1
-    if current_player == 1:  # Vérifie que c'est bien le tour du joueur 1
-        size = len(board_j1)
-        x, y = event.x // 150, event.y // 150
-        blank_x, blank_y = find_blank(board_j1)
-        if abs(blank_x - y) + abs(blank_y - x) == 1:
-            board_j1[blank_x][blank_y], board_j1[y][x] = board_j1[y][x], board_j1[blank_x][blank_y]
-            update_display_j1()
-            shuffle_button_j1['state'] = 'disabled'
-
-            # Vérifie si le joueur 1 a gagné
-            if board_j1 == goal_state:
-                show_congratulations_multiplayer(1)
-            else:
-                # Passe au joueur 2
-                current_player = 2
-                disable_canvas(puzzle_canvas_j1)
-                enable_canvas(puzzle_canvas_j2)
-
-def move_tile_j2(event):
-    global board_j2, current_player, shuffle_button_j2
-    if current_player == 2:  # Vérifie que c'est bien le tour du joueur 2
-        size = len(board_j2)
-        x, y = event.x // 150, event.y // 150
-        blank_x, blank_y = find_blank(board_j2)
-        if abs(blank_x - y) + abs(blank_y - x) == 1:
-            board_j2[blank_x][blank_y], board_j2[y][x] = board_j2[y][x], board_j2[blank_x][blank_y]
-            update_display_j2()
-            shuffle_button_j2['state'] = 'disabled'
-
-            # Vérifie si le joueur 2 a gagné
-            if board_j2 == goal_state:
-                show_congratulations_multiplayer(2)
-            else:
-                # Passe au joueur 1
-                current_player = 1
-                disable_canvas(puzzle_canvas_j2)
-                enable_canvas(puzzle_canvas_j1)
+    multiplayer_game = MultiBoardGame(game_frame, size, player_count, tile_size=tile_size)
+    set_resize_handler(multiplayer_game.fit_to_window)
 
-def show_congratulations_multiplayer(winning_player):
+class BoardView:
+    """
+    Vue d'un plateau : un titre, un canvas et le plateau affiché.
+    Toutes les vues dessinent avec le jeu de tuiles partagé `photos` : aucune image n'est dupliquée par plateau.
+    Le clic est lié une seule fois à `on_click(view, event)` ; c'est au contrôleur de filtrer les tours.
+    """
+    def __init__(self, parent, title, size, on_click, tile_size=DEFAULT_TILE_SIZE):
+        self.board = [row[:] for row in goal_state]
+        self.tile_size = tile_size
+
+        self.frame = tk.Frame(parent, bg=COLORS['background'])
+        Label(
+            self.frame,
+            text=title,
+            font=('Helvetica', 16, 'bold'),
+            bg=COLORS['background'],
+            fg=COLORS['text']
+        ).pack()
+
+        self.canvas = Canvas(
+            self.frame,
+            width=size*tile_size,
+            height=size*tile_size,
+            bg=COLORS['white'],
+            highlightthickness=2,
+            highlightbackground=COLORS['primary']
+        )
+        self.canvas.pack(pady=10)
+        self.canvas.bind("<Button-1>", lambda e: on_click(self, e))
+
+    def redraw(self):
+        draw_board(self.canvas, self.board, self.tile_size)
+
+    def resize(self, tile_px):
+        """Change la taille des tuiles du plateau et le redessine."""
+        size = len(self.board)
+        self.tile_size = tile_px
+        self.canvas.config(width=size*tile_px, height=size*tile_px)
+        self.redraw()
+
+    def cell_at(self, x, y):
+        """
+        Retourne (ligne, colonne) de la case sous le point (x, y) du canvas.
+        Les clics sur la bordure sont ramenés à la case la plus proche.
+        """
+        last = len(self.board) - 1
+        return (min(last, max(0, y // self.tile_size)),
+                min(last, max(0, x // self.tile_size)))
+
+    def try_move(self, row, col):
+        """
+        Fait glisser la tuile (row, col) vers la case vide si elles sont voisines.
+        Retourne True si le coup a été joué.
+        """
+        blank_x, blank_y = find_blank(self.board)
+        if abs(blank_x - row) + abs(blank_y - col) != 1:
+            return False
+        self.board[blank_x][blank_y], self.board[row][col] = self.board[row][col], self.board[blank_x][blank_y]
+        self.redraw()
+        return True
+
+    def set_active(self, active):
+        """Met en évidence le plateau du joueur dont c'est le tour."""
+        self.canvas['highlightbackground'] = COLORS['text'] if active else COLORS['primary']
+
+class MultiBoardGame:
+    """
+    Contrôleur d'une partie à N plateaux dans une seule fenêtre, joués à tour de rôle.
+    Chaque canvas est lié une seule fois ; les clics hors tour sont simplement ignorés.
+    """
+    def __init__(self, parent, size, player_count, columns=4, tile_size=DEFAULT_TILE_SIZE):
+        self.views = []
+        self.shuffle_buttons = []
+        self.quit_buttons = []
+        self.players = list(range(player_count))  # joueurs encore en lice
+        self.current = 0
+        self.columns = min(columns, player_count)
+        self.rows = (player_count + self.columns - 1) // self.columns
+
+        for idx in range(player_count):
+            view = BoardView(parent, f"Joueur {idx + 1}", size, self.on_click, tile_size=tile_size)
+            view.frame.grid(row=idx // self.columns, column=idx % self.columns, padx=20)
+
+            shuffle_button_ref = StyledButton(view.frame, text="Mélanger", command=lambda v=view: self.shuffle(v))
+            shuffle_button_ref.pack(pady=5)
+            quit_button = StyledButton(view.frame, text="Quitter", command=lambda n=idx + 1: quitter_partie(n))
+            quit_button.pack(pady=5)
+
+            self.views.append(view)
+            self.shuffle_buttons.append(shuffle_button_ref)
+            self.quit_buttons.append(quit_button)
+            view.redraw()
+
+        self.update_turn()
+        self.recordings = [None] * player_count
+        self.scrambles = None
+        self.prepare_scrambles(size)
+
+    def prepare_scrambles(self, size):
+        """
+        Prépare en arrière-plan un plateau mélangé par joueur, tous à la même distance
+        optimale de la solution. Les boutons "Mélanger" sont actifs une fois le lot prêt.
+        """
+        for shuffle_button_ref in self.shuffle_buttons:
+            shuffle_button_ref['state'] = 'disabled'
+
+        def worker():
+            boards, _ = tournament_scrambles(size, len(self.views))
+            fenetre.after(0, self.scrambles_ready, boards)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def scrambles_ready(self, boards):
+        if not self.views[0].canvas.winfo_exists():  # la partie a été quittée entre-temps
+            return
+        self.scrambles = boards
+        for idx in self.players:
+            if self.views[idx].board == goal_state:  # joueur qui n'a encore ni mélangé ni joué
+                self.shuffle_buttons[idx]['state'] = 'normal'
+
+    def fit_to_window(self):
+        fit_views_to_window(self.views, self.rows, self.columns)
+
+    def on_click(self, view, event):
+        idx = self.views.index(view)
+        if idx != self.current:  # Vérifie que c'est bien le tour de ce joueur
+            return
+        start_board = [row[:] for row in view.board]
+        blank = find_blank(view.board)
+        cell = view.cell_at(event.x, event.y)
+        if not view.try_move(*cell):
+            return
+        self.shuffle_buttons[idx]['state'] = 'disabled'
+        if self.recordings[idx] is None:
+            self.recordings[idx] = GameRecording(start_board)
+        self.recordings[idx].record(move_between(blank, cell))
+
+        # Vérifie si le joueur a gagné, sinon passe au suivant
+        if view.board == goal_state:
+            self.end_recordings(winner=idx)
+            show_congratulations_multiplayer(view, idx + 1)
+        else:
+            self.next_turn()
+
+    def end_recordings(self, winner=None):
+        """Termine l'enregistrement de tous les plateaux ; seul `winner` est compté comme résolu."""
+        for idx, recording in enumerate(self.recordings):
+            if recording is not None:
+                recording.end(idx == winner)
+
+    def next_turn(self):
+        pos = self.players.index(self.current)
+        self.current = self.players[(pos + 1) % len(self.players)]
+        self.update_turn()
+
+    def update_turn(self):
+        for idx, view in enumerate(self.views):
+            view.set_active(idx == self.current)
+
+    def shuffle(self, view):
+        """Distribue au joueur son plateau du lot (même difficulté pour tous)."""
+        if self.scrambles is None:
+            return
+        idx = self.views.index(view)
+        view.board = [row[:] for row in self.scrambles[idx]]
+        self.shuffle_buttons[idx]['state'] = 'disabled'
+        view.redraw()
+
+    def abandon(self, joueur):
+        """
+        Retire le joueur `joueur` (numéroté à partir de 1) de la partie.
+        Retourne le numéro du gagnant s'il ne reste qu'un joueur, sinon None.
+        """
+        idx = joueur - 1
+        if idx not in self.players:
+            return None
+        if idx == self.current:
+            self.next_turn()
+        self.players.remove(idx)
+        self.shuffle_buttons[idx]['state'] = 'disabled'
+        self.quit_buttons[idx]['state'] = 'disabled'
+        if self.recordings[idx] is not None:
+            self.recordings[idx].end(False)
+        if len(self.players) == 1:
+            self.end_recordings()
+            return self.players[0] + 1
+        self.update_turn()
+        return None
+
+def fit_views_to_window(views, rows, columns):
+    """
+    Adapte la taille des tuiles de plusieurs plateaux à la fenêtre (jeu de tuiles partagé).
+    """
+    global tile_size, photos
+    if not views[0].canvas.winfo_exists():
+        return
+    size = len(views[0].board)
+    # plusieurs plateaux : on descend sous MIN_TILE_SIZE plutôt que de déborder de la fenêtre
+    tile_size = compute_tile_size(size, views[0].canvas, rows, columns, min_tile=MIN_MULTI_TILE_SIZE)
+    photos = load_image_and_create_tiles(size, tile_size)
+    for view in views:
+        view.resize(tile_size)
+
+def show_congratulations_multiplayer(view, winning_player):
     """
     Affiche l'image complète et un message de félicitations pour le joueur gagnant.
     """
@@ -513,8 +926,8 @@ def show_congratulations_multiplayer(winning_player):
         image_source = Image.open(image_source_path)
 
         # Redimensionner l'image source à la taille du canvas
-        size = len(board_j1)
-        total_size = size * 150
+        size = len(view.board)
+        total_size = size * view.tile_size
         try:
             resample_filter = Image.Resampling.LANCZOS
         except AttributeError:
@@ -524,15 +937,10 @@ def show_congratulations_multiplayer(winning_player):
         # Convertir l'image pour tkinter
         image_complete = ImageTk.PhotoImage(image_source)
 
-        # Afficher l'image complète dans le canvas correspondant
-        if winning_player == 1:
-            puzzle_canvas_j1.delete("all")
-            puzzle_canvas_j1.create_image(0, 0, anchor=tk.NW, image=image_complete)
-            puzzle_canvas_j1.image = image_complete
-        elif winning_player == 2:
-            puzzle_canvas_j2.delete("all")
-            puzzle_canvas_j2.create_image(0, 0, anchor=tk.NW, image=image_complete)
-            puzzle_canvas_j2.image = image_complete
+        # Afficher l'image complète dans le canvas du gagnant
+        view.canvas.delete("all")
+        view.canvas.create_image(0, 0, anchor=tk.NW, image=image_complete)
+        view.canvas.image = image_complete
 
         # Afficher un message de félicitations
         if fenetre.winfo_exists():
@@ -542,33 +950,24 @@ def show_congratulations_multiplayer(winning_player):
     except Exception as e:
         print("Erreur lors de l'affichage de l'image complète :", e)
 
-def disable_canvas(canvas):
-    """
-    Désactive un canvas pour empêcher les clics.
-    """
-    canvas.unbind("<Button-1>")  # Supprime l'événement lié au clic
-
-def enable_canvas(canvas):
-    """
-    Active un canvas pour autoriser les clics.
-    """
-    if canvas == puzzle_canvas_j1:
-        canvas.bind("<Button-1>", move_tile_j1)
-    elif canvas == puzzle_canvas_j2:
-        canvas.bind("<Button-1>", move_tile_j2)
-
 def disable_shuffle_button_and_move(event, board, puzzle_canvas, shuffle_button_ref):
     """
     Fonction générique appelée pour détecter un déplacement dans le puzzle.
     Désactive le bouton "Mélanger" après le premier déplacement.
     """
+    global current_recording
     size = len(board)
-    x, y = event.x // 150, event.y // 150
+    x, y = event.x // tile_size, event.y // tile_size
     blank_x, blank_y = find_blank(board)
     if abs(blank_x - y) + abs(blank_y - x) == 1:
         # Obtenir la position de départ et d'arrivée
-        start_x, start_y = blank_y * 150, blank_x * 150
-        end_x, end_y = y * 150, x * 150
+        start_x, start_y = blank_y * tile_size, blank_x * tile_size
+        end_x, end_y = y * tile_size, x * tile_size
+
+        # Le premier coup démarre l'enregistrement de la partie
+        if current_recording is None:
+            current_recording = GameRecording(board)
+        current_recording.record(move_between((blank_x, blank_y), (y, x)))
 
         # Déplacer la tuile dans le tableau
         board[blank_x][blank_y], board[y][x] = board[y][x], board[blank_x][blank_y]
@@ -581,15 +980,7 @@ def disable_shuffle_button_and_move(event, board, puzzle_canvas, shuffle_button_
             pass
 
         # Supprimer l'ancienne position après l'animation
-        puzzle_canvas.delete("all")
-        for i in range(size):
-            for j in range(size):
-                value = board[i][j]
-                if value != 0:
-                    try:
-                        puzzle_canvas.create_image(j * 150, i * 150, anchor=tk.NW, image=photos[value])
-                    except Exception:
-                        puzzle_canvas.create_text(j*150+75, i*150+75, text=str(value), font=('Helvetica', 24))
+        draw_board(puzzle_canvas, board, tile_size)
 
         try:
             if shuffle_button_ref['state'] == 'normal':
@@ -598,29 +989,23 @@ def disable_shuffle_button_and_move(event, board, puzzle_canvas, shuffle_button_
             pass
 
         if board == goal_state:
+            current_recording.end(True)
+            current_recording = None
             show_congratulations()
 
 def shuffle_puzzle():
+    """
+    Mélange uniforme en solo. En mode IA, un 4x4 uniforme est hors de portée de A*
+    (limite d'exploration) : on distribue un plateau à distance de tournoi.
+    """
     global board_j1
-    for _ in range(100):
-        neighbors = generate_neighbors(board_j1)
-        board_j1 = random.choice(neighbors)
+    size = len(board_j1)
+    if mode_de_jeu == "ia" and size == 4:
+        board_j1 = tournament_scrambles(size, 1)[0][0]
+    else:
+        board_j1 = random_solvable_board(size)
     update_display()
 
-def shuffle_puzzle_j1():
-    global board_j1
-    for _ in range(100):
-        neighbors = generate_neighbors(board_j1)
-        board_j1 = random.choice(neighbors)
-    update_display_j1()
-
-def shuffle_puzzle_j2():
-    global board_j2
-    for _ in range(100):
-        neighbors = generate_neighbors(board_j2)
-        board_j2 = random.choice(neighbors)
-    update_display_j2()
-
 def solve_puzzle_and_disable_shuffle(shuffle_button_ref, heuristic="manhattan"):
     """
     Résout le puzzle en utilisant l'algorithme A* dans un thread et lance l'exécution
@@ -631,13 +1016,13 @@ def solve_puzzle_and_disable_shuffle(shuffle_button_ref, heuristic="manhattan"):
     # Capture l'état initial (copie profonde)
     initial = [row[:] for row in board_j1]
 
-    solution = a_star(initial, goal_state, heuristic=heuristic)
+    solution = a_star(initial, goal_state, heuristic=heuristic, on_metrics=report_metrics)
 
     # Si l'UI a été fermée pendant la recherche, on s'arrête proprement
     if not fenetre.winfo_exists():
         return
 
-    if solution:
+    if solution is not None:
         # Exécuter la solution via fenetre.after pour rester dans le thread Tkinter
         fenetre.after(0, lambda: execute_solution(solution))
     else:
@@ -652,6 +1037,62 @@ def solve_puzzle_and_disable_shuffle(shuffle_button_ref, heuristic="manhattan"):
         except Exception:
             pass
 
+def compare_heuristics():
+    """
+    Résout le plateau actuel avec Manhattan puis Hamming (dans un thread) pour remplir
+    le panneau de mesures, sans jouer la solution.
+    """
+    initial = [row[:] for row in board_j1]
+
+    def worker():
+        for heuristic in MetricsPanel.HEURISTICS:
+            a_star(initial, goal_state, heuristic=heuristic, on_metrics=report_metrics)
+
+    threading.Thread(target=worker, daemon=True).start()
+
+def report_metrics(metrics):
+    """
+    Transmet les mesures du solveur (thread de calcul) au panneau du mode IA (thread Tkinter).
+    """
+    values = metrics.as_dict()
+    try:
+        fenetre.after(0, lambda: metrics_panel is not None and metrics_panel.show(metrics.heuristic, values))
+    except RuntimeError:
+        pass  # l'interface est fermée
+
+class MetricsPanel(tk.Frame):
+    """
+    Panneau du mode IA : mesures du solveur pour Manhattan et Hamming côte à côte.
+    """
+    HEURISTICS = ("manhattan", "hamming")
+
+    def __init__(self, master):
+        super().__init__(master, bg=COLORS['background'])
+        for col, title in enumerate(("", "Manhattan", "Hamming")):
+            Label(self, text=title, font=('Helvetica', 11, 'bold'),
+                  bg=COLORS['background'], fg=COLORS['text']).grid(row=0, column=col, padx=5, sticky='w')
+        self.cells = {}
+        for row, (name, label) in enumerate(SolverMetrics.LABELS, start=1):
+            Label(self, text=label, font=('Helvetica', 10),
+                  bg=COLORS['background'], fg=COLORS['text']).grid(row=row, column=0, padx=5, sticky='w')
+            for col, heuristic in enumerate(self.HEURISTICS, start=1):
+                cell = Label(self, text="-", font=('Helvetica', 10), width=10, anchor='e',
+                             bg=COLORS['background'], fg=COLORS['text'])
+                cell.grid(row=row, column=col, padx=5)
+                self.cells[(name, heuristic)] = cell
+
+    def show(self, heuristic, values):
+        if not self.winfo_exists():
+            return
+        for name, value in values.items():
+            if value is None:
+                text = "-"
+            elif isinstance(value, float):
+                text = f"{value:.2f}"
+            else:
+                text = str(value)
+            self.cells[(name, heuristic)]['text'] = text
+
 def find_blank(state):
     for i in range(len(state)):
         for j in range(len(state[i])):
@@ -679,28 +1120,51 @@ def hamming_distance(state):
                 distance += 1
     return distance
 
-def generate_neighbors(state):
+# Coups exprimés par le déplacement de la case vide : haut, bas, gauche, droite
+MOVES = {'U': (-1, 0), 'D': (1, 0), 'L': (0, -1), 'R': (0, 1)}
+
+def apply_move(state, move):
     """
-    Retourne la liste d'états voisins en déplaçant la tuile vide.
+    Applique un coup (U/D/L/R) sur le plateau, en place.
+    Retourne ((ligne, colonne) de départ, (ligne, colonne) d'arrivée) de la tuile déplacée,
+    ou None si le coup sort du plateau.
+    """
+    x, y = find_blank(state)
+    dx, dy = MOVES[move]
+    new_x, new_y = x + dx, y + dy
+    if not (0 <= new_x < len(state) and 0 <= new_y < len(state[0])):
+        return None
+    state[x][y], state[new_x][new_y] = state[new_x][new_y], state[x][y]
+    return (new_x, new_y), (x, y)
+
+def generate_moves(state):
+    """
+    Retourne la liste des couples (coup, état voisin) obtenus en déplaçant la tuile vide.
     """
     neighbors = []
     x, y = find_blank(state)
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
 
-    for dx, dy in moves:
+    for move, (dx, dy) in MOVES.items():
         new_x, new_y = x + dx, y + dy
         if 0 <= new_x < len(state) and 0 <= new_y < len(state[0]):
             new_state = [row[:] for row in state]
             new_state[x][y], new_state[new_x][new_y] = new_state[new_x][new_y], new_state[x][y]
-            neighbors.append(new_state)
+            neighbors.append((move, new_state))
 
     return neighbors
 
+def generate_neighbors(state):
+    """
+    Retourne la liste d'états voisins en déplaçant la tuile vide.
+    """
+    return [new_state for _, new_state in generate_moves(state)]
+
 class Node:
-    def __init__(self, state, parent=None, g=0, heuristic="manhattan"):
+    def __init__(self, state, parent=None, g=0, heuristic="manhattan", move=None):
         self.state = state
         self.parent = parent
         self.g = g
+        self.move = move  # coup (U/D/L/R) qui mène du parent à cet état
 
         # Choisissez l'heuristique à utiliser
         if heuristic == "hamming":
@@ -713,13 +1177,72 @@ class Node:
     def __lt__(self, other):
         return self.f < other.f
 
-def a_star(initial_state, goal_state_param, heuristic="manhattan"):
+# Fonctions appelées avec les mesures (SolverMetrics) de chaque résolution A* terminée
+solver_hooks = []
+METRICS_INTERVAL = 5000  # nœuds développés entre deux rapports intermédiaires
+
+class SolverMetrics:
+    """
+    Mesures d'une résolution A* : travail effectué, tailles maximales des structures,
+    temps écoulé et mémoire approximative.
+    """
+    LABELS = [
+        ("nodes_expanded", "Nœuds développés"),
+        ("nodes_generated", "Nœuds générés"),
+        ("duplicate_hits", "Doublons (g_scores)"),
+        ("peak_open", "Pic liste ouverte"),
+        ("peak_closed", "Pic ensemble fermé"),
+        ("heuristic_calls", "Appels heuristique"),
+        ("elapsed", "Temps (s)"),
+        ("memory_kb", "Mémoire approx. (Ko)"),
+        ("solution_length", "Longueur solution"),
+    ]
+
+    def __init__(self, heuristic):
+        self.heuristic = heuristic
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.duplicate_hits = 0
+        self.peak_open = 0
+        self.peak_closed = 0
+        self.heuristic_calls = 0
+        self.elapsed = 0.0
+        self.memory_kb = 0
+        self.solution_length = None
+        self.finished = False
+        self.start_time = time.perf_counter()
+
+    def update(self, open_heap, closed_set, g_scores):
+        """
+        Met à jour le temps écoulé et la mémoire approximative : taille des conteneurs
+        plus un état (tuple de tuples) par entrée de g_scores et un nœud par entrée de la liste ouverte.
+        """
+        self.elapsed = time.perf_counter() - self.start_time
+        self.peak_closed = max(self.peak_closed, len(closed_set))
+        if not g_scores:
+            return
+        sample = next(iter(g_scores))
+        state_bytes = sys.getsizeof(sample) + sum(sys.getsizeof(row) for row in sample)
+        node_bytes = 200 + state_bytes  # objet Node, son dict, sa liste d'état et l'entrée du tas
+        total = (sys.getsizeof(open_heap) + sys.getsizeof(closed_set) + sys.getsizeof(g_scores)
+                 + len(g_scores) * state_bytes + self.peak_open * node_bytes)
+        self.memory_kb = total // 1024
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name, _ in self.LABELS}
+
+@profiler.solve
+def a_star(initial_state, goal_state_param, heuristic="manhattan", on_metrics=None):
     """
     Algorithme A* robuste avec closed_set et g_scores.
-    Retourne la liste d'états de la solution (inclusive) ou None si échec / limite atteinte.
+    Retourne la suite de coups de la solution (chaîne de U/D/L/R, vide si l'état initial est le but)
+    ou None si échec / limite atteinte.
+    Si `on_metrics` est fourni, il est appelé avec les SolverMetrics tous les METRICS_INTERVAL
+    nœuds développés puis à la fin ; les fonctions de `solver_hooks` sont appelées à la fin.
     """
     max_explored = 300000  # limite pour éviter explosion mémoire (ajuster si nécessaire)
     n = len(initial_state)
+    metrics = SolverMetrics(heuristic)
 
     def state_to_tuple(s):
         return tuple(tuple(row) for row in s)
@@ -731,49 +1254,929 @@ def a_star(initial_state, goal_state_param, heuristic="manhattan"):
     start_node = Node(initial_state, parent=None, g=0, heuristic=heuristic)
     heapq.heappush(open_heap, (start_node.f, 0, start_node))  # tie-breaker by counter
     counter = 1
+    metrics.heuristic_calls = 1
 
     g_scores = {start_tuple: 0}
     closed_set = set()
     explored = 0
 
+    def finish(solution):
+        metrics.update(open_heap, closed_set, g_scores)
+        metrics.solution_length = None if solution is None else len(solution)
+        metrics.finished = True
+        if on_metrics is not None:
+            on_metrics(metrics)
+        for hook in solver_hooks:
+            hook(metrics)
+        return solution
+
     while open_heap:
         _, _, current_node = heapq.heappop(open_heap)
         current_tuple = state_to_tuple(current_node.state)
 
-        # Si c'est le but, reconstituer la solution
+        # Si c'est le but, reconstituer la suite de coups
         if current_tuple == goal_tuple:
             path = []
             node = current_node
-            while node:
-                path.append(node.state)
+            while node.parent:
+                path.append(node.move)
                 node = node.parent
             path.reverse()
-            return path
+            return finish("".join(path))
 
         if current_tuple in closed_set:
             continue
 
         closed_set.add(current_tuple)
         explored += 1
+        metrics.nodes_expanded = explored
         if explored > max_explored:
             print("A*: limite d'exploration atteinte.")
-            return None
+            return finish(None)
+        if on_metrics is not None and explored % METRICS_INTERVAL == 0:
+            metrics.update(open_heap, closed_set, g_scores)
+            on_metrics(metrics)
 
         # Générer voisins
-        for neighbor in generate_neighbors(current_node.state):
+        for move, neighbor in generate_moves(current_node.state):
             neighbor_tuple = state_to_tuple(neighbor)
             tentative_g = current_node.g + 1
+            metrics.nodes_generated += 1
 
             # Si on a déjà un meilleur coût pour ce voisin, ignorer
             if neighbor_tuple in g_scores and tentative_g >= g_scores[neighbor_tuple]:
+                metrics.duplicate_hits += 1
                 continue
 
             g_scores[neighbor_tuple] = tentative_g
-            child = Node(neighbor, parent=current_node, g=tentative_g, heuristic=heuristic)
+            child = Node(neighbor, parent=current_node, g=tentative_g, heuristic=heuristic, move=move)
+            metrics.heuristic_calls += 1
             heapq.heappush(open_heap, (child.f, counter, child))
             counter += 1
+        if len(open_heap) > metrics.peak_open:
+            metrics.peak_open = len(open_heap)
+
+    return finish(None)  # aucun chemin trouvé
+
+@profiler.timed("lrta_star_step")
+def lrta_star_step(state, goal, learned, budget, min_nodes=1, max_nodes=None):
+    """
+    Une décision de LRTA* avec anticipation bornée par un budget de temps CPU (en secondes,
+    mesuré sur le thread appelant). Un A* local est développé depuis `state` tant que le budget
+    le permet, en développant au moins `min_nodes` et au plus `max_nodes` nœuds : ces bornes
+    gardent l'anticipation proportionnée au budget quand l'horloge est grossière (thread_time
+    n'avance que par pas d'environ 15 ms sous Windows). L'heuristique apprise de `state` (dictionnaire `learned`, modifié en place) est
+    relevée au meilleur f de la frontière, et on retourne le premier coup vers ce nœud.
+    Si le but est atteint pendant l'anticipation, toute la solution est retournée.
+    Retourne une chaîne d'au moins un coup.
+    """
+    deadline = time.thread_time() + budget
+
+    def state_to_tuple(s):
+        return tuple(tuple(row) for row in s)
+
+    def h(key, s):
+        return learned[key] if key in learned else manhattan_distance(s)
+
+    start_tuple = state_to_tuple(state)
+    goal_tuple = state_to_tuple(goal)
+    open_heap = [(h(start_tuple, state), 0, 0, state, "")]
+    g_scores = {start_tuple: 0}
+    closed_set = set()
+    counter = 1
+
+    def within_budget():
+        expanded = len(closed_set)
+        if expanded < min_nodes:
+            return True
+        return (max_nodes is None or expanded < max_nodes) and time.thread_time() < deadline
+
+    while open_heap and within_budget():
+        f, _, g, current, path = heapq.heappop(open_heap)
+        current_tuple = state_to_tuple(current)
+        if current_tuple == goal_tuple:
+            return path
+        if current_tuple in closed_set:
+            continue
+        closed_set.add(current_tuple)
+        for move, neighbor in generate_moves(current):
+            neighbor_tuple = state_to_tuple(neighbor)
+            if neighbor_tuple in g_scores and g + 1 >= g_scores[neighbor_tuple]:
+                continue
+            g_scores[neighbor_tuple] = g + 1
+            heapq.heappush(open_heap, (g + 1 + h(neighbor_tuple, neighbor), counter, g + 1, neighbor, path + move))
+            counter += 1
+
+    # meilleur nœud de la frontière (hors nœuds déjà développés)
+    while open_heap and state_to_tuple(open_heap[0][3]) in closed_set:
+        heapq.heappop(open_heap)
+    f, _, g, best, path = open_heap[0]
+    if state_to_tuple(best) == goal_tuple:
+        return path
+    learned[start_tuple] = max(h(start_tuple, state), f)
+    return path[0]
+
+IDA_MAX_NODES = 5000000  # environ 15 s en Python ; au-delà, optimum non calculé
+
+def ida_star(initial_state, max_nodes=IDA_MAX_NODES):
+    """
+    IDA* avec Manhattan plus conflits linéaires (tables de BatchTables, nécessite NumPy).
+    L'heuristique est mise à jour à chaque coup au lieu d'être recalculée, et la mémoire reste
+    linéaire en la profondeur : les 4x4 tirés uniformément (~50 coups), hors de portée de a_star,
+    sont en général résolus en quelques secondes.
+    Retourne la suite de coups optimale, ou None après `max_nodes` nœuds développés.
+    """
+    if np is None:
+        raise ImportError("IDA* nécessite NumPy (pip install numpy).")
+    size = len(initial_state)
+    if size not in batch_tables:
+        batch_tables[size] = BatchTables(size)
+    tables = batch_tables[size]
+    md = tables.manhattan.tolist()
+    row_code = tables.row_code.tolist()
+    col_code = tables.col_code.tolist()
+    removals = tables.line_removals.tolist()
+    powers = tables.powers.tolist()
+    neighbor = tables.neighbor.tolist()
+
+    cells = [value for row in initial_state for value in row]
+    row_keys = [sum(row_code[cells[i*size + j]][i*size + j] * powers[j] for j in range(size)) for i in range(size)]
+    col_keys = [sum(col_code[cells[i*size + j]][i*size + j] * powers[i] for i in range(size)) for j in range(size)]
+    h = (sum(md[value][pos] for pos, value in enumerate(cells))
+         + 2 * (sum(removals[key] for key in row_keys) + sum(removals[key] for key in col_keys)))
+    path = []
+    nodes = 0
+
+    def search(blank, g, h, threshold, last):
+        nonlocal nodes
+        if h == 0:
+            return True, g
+        nodes += 1
+        if nodes > max_nodes:
+            return False, None
+        next_threshold = None
+        for k in range(4):
+            target = neighbor[blank][k]
+            if target < 0 or k == last ^ 1:
+                continue
+            value = cells[target]
+            new_h = h + md[value][blank] - md[value][target]
+            if k < 2:  # la tuile change de ligne et glisse dans sa colonne
+                lines, codes, old_line, new_line = row_keys, row_code, target // size, blank // size
+                old_shift, new_shift = powers[target % size], powers[blank % size]
+                along, along_codes, along_line = col_keys, col_code, target % size
+                along_shift = powers[blank // size] - powers[target // size]
+            else:      # la tuile change de colonne et glisse dans sa ligne
+                lines, codes, old_line, new_line = col_keys, col_code, target % size, blank % size
+                old_shift, new_shift = powers[target // size], powers[blank // size]
+                along, along_codes, along_line = row_keys, row_code, target // size
+                along_shift = powers[blank % size] - powers[target % size]
+            old_key, new_key = lines[old_line], lines[new_line]
+            # la case vide ne compte pas : glisser le long d'une ligne n'en change pas les conflits
+            along_key = along[along_line]
+            along_key2 = along_key + along_codes[value][target] * along_shift
+            old_key2 = old_key - codes[value][target] * old_shift
+            new_key2 = new_key + codes[value][blank] * new_shift
+            new_h += 2 * (removals[old_key2] - removals[old_key] + removals[new_key2] - removals[new_key])
+            f = g + 1 + new_h
+            if f > threshold:
+                if next_threshold is None or f < next_threshold:
+                    next_threshold = f
+                continue
+            cells[blank], cells[target] = value, 0
+            lines[old_line], lines[new_line] = old_key2, new_key2
+            along[along_line] = along_key2
+            path.append(MOVE_LETTERS[k])
+            found, bound = search(target, g + 1, new_h, threshold, k)
+            if found:
+                return True, bound
+            path.pop()
+            cells[blank], cells[target] = 0, value
+            lines[old_line], lines[new_line] = old_key, new_key
+            along[along_line] = along_key
+            if bound is None and nodes > max_nodes:
+                return False, None
+            if bound is not None and (next_threshold is None or bound < next_threshold):
+                next_threshold = bound
+        return False, next_threshold
+
+    threshold = h
+    blank = cells.index(0)
+    while threshold is not None:
+        found, threshold = search(blank, 0, h, threshold, -1)
+        if found:
+            return "".join(path)
+    return None
+
+# Distance optimale visée pour les mélanges de tournoi (tous les joueurs reçoivent la même)
+TOURNAMENT_DISTANCE = {3: 20, 4: 20}
+
+def make_goal(size):
+    """
+    Retourne l'état final d'un puzzle `size`x`size`.
+    """
+    cells = list(range(1, size*size)) + [0]
+    return [cells[i*size:(i+1)*size] for i in range(size)]
+
+def is_solvable(board):
+    """
+    Indique si le plateau peut être ramené à l'état final.
+    Critère : la parité de la permutation des cases (case vide comprise) doit être égale
+    à la parité de la distance de Manhattan entre la case vide et sa position finale.
+    Calculé en O(n²) par décomposition en cycles.
+    """
+    size = len(board)
+    cells = [value for row in board for value in row]
+    # position finale de chaque valeur : 1..n²-1 puis la case vide en dernier
+    target = [(value - 1) % (size*size) for value in cells]
+
+    seen = [False] * len(cells)
+    transpositions = 0
+    for start in range(len(cells)):
+        length = 0
+        k = start
+        while not seen[k]:
+            seen[k] = True
+            k = target[k]
+            length += 1
+        if length:
+            transpositions += length - 1
+
+    blank_x, blank_y = find_blank(board)
+    blank_distance = (size - 1 - blank_x) + (size - 1 - blank_y)
+    return transpositions % 2 == blank_distance % 2
+
+def random_solvable_board(size, rng=random):
+    """
+    Tire un plateau résoluble uniformément au hasard en O(n²).
+    On mélange toutes les cases (Fisher-Yates) ; si le résultat est insoluble, échanger deux
+    tuiles non vides le rend soluble. Cet échange est une bijection entre plateaux insolubles et
+    solubles, donc le tirage reste uniforme.
+    """
+    cells = list(range(size*size))
+    rng.shuffle(cells)
+    board = [cells[i*size:(i+1)*size] for i in range(size)]
+    if not is_solvable(board):
+        tiles = [(i, j) for i in range(size) for j in range(size) if board[i][j] != 0][:2]
+        (i1, j1), (i2, j2) = tiles
+        board[i1][j1], board[i2][j2] = board[i2][j2], board[i1][j1]
+    return board
+
+def random_walk_board(size, length, rng=random):
+    """
+    Retourne le plateau obtenu par `length` déplacements aléatoires de la case vide
+    depuis l'état final, sans jamais annuler le coup précédent.
+    """
+    opposite = {'U': 'D', 'D': 'U', 'L': 'R', 'R': 'L'}
+    board = make_goal(size)
+    previous = None
+    for _ in range(length):
+        moves = [move for move, _ in generate_moves(board) if move != opposite.get(previous)]
+        previous = rng.choice(moves)
+        apply_move(board, previous)
+    return board
+
+def board_at_distance(size, distance, rng=random, max_attempts=20):
+    """
+    Retourne un plateau dont la solution optimale fait exactement `distance` coups,
+    ou None si aucun n'a été trouvé.
+    On part d'un plateau plus éloigné (tirage uniforme en 3x3, marche aléatoire en 4x4),
+    on le résout avec A* puis on avance le long de la solution optimale jusqu'à ce qu'il
+    ne reste que `distance` coups : chaque coup d'une solution optimale rapproche du but d'exactement un.
+    """
+    goal = make_goal(size)
+    walk_length = distance + 10
+    for _ in range(max_attempts):
+        if size == 3:
+            board = random_solvable_board(size, rng)
+        else:
+            board = random_walk_board(size, walk_length, rng)
+        solution = a_star(board, goal)
+        if solution is None:
+            # limite d'exploration atteinte : un départ plus proche sera plus facile à résoudre
+            walk_length = max(distance, walk_length - 4)
+            continue
+        if len(solution) < distance:
+            walk_length += 4
+            continue
+        for move in solution[:len(solution) - distance]:
+            apply_move(board, move)
+        return board
+    return None
+
+def generate_scrambles(size, count, distance=None, rng=random):
+    """
+    Génère `count` plateaux d'un coup, par exemple pour un tournoi.
+    Sans `distance`, les plateaux sont tirés uniformément ; sinon ils sont tous exactement
+    à `distance` coups de la solution, donc de même difficulté.
+    """
+    if distance is None:
+        return [random_solvable_board(size, rng) for _ in range(count)]
+    boards = []
+    for _ in range(count):
+        board = board_at_distance(size, distance, rng)
+        if board is None:
+            return None
+        boards.append(board)
+    return boards
+
+def tournament_scrambles(size, count, rng=random):
+    """
+    Plateaux de tournoi : tous à la même distance optimale, TOURNAMENT_DISTANCE si possible.
+    Si A* atteint sa limite d'exploration, on réessaie à des distances plus courtes plutôt
+    que de distribuer des plateaux de difficultés différentes.
+    Retourne (plateaux, distance).
+    """
+    distance = TOURNAMENT_DISTANCE.get(size, 20)
+    while True:
+        boards = generate_scrambles(size, count, distance, rng)
+        if boards is not None:
+            return boards, distance
+        distance = max(1, distance - 4)
+
+# Moteur vectorisé (NumPy) : évaluation et expansion de milliers de plateaux à la fois
+
+class BatchTables:
+    """
+    Tables de correspondance d'une taille de puzzle, indexées par [valeur, position] :
+    distance de Manhattan, codes des conflits linéaires et cases voisines de la case vide.
+    """
+    def __init__(self, size):
+        cells = size * size
+        self.size = size
+        self.positions = np.arange(cells)
+        self.goal = np.array(list(range(1, cells)) + [0], dtype=np.uint8)
+
+        self.manhattan = np.zeros((cells, cells), dtype=np.uint8)
+        # code d'une tuile dans sa ligne (resp. colonne) : 1 + colonne (resp. ligne) visée si la
+        # tuile est déjà dans sa ligne (resp. colonne) finale, 0 sinon
+        self.row_code = np.zeros((cells, cells), dtype=np.int64)
+        self.col_code = np.zeros((cells, cells), dtype=np.int64)
+        for value in range(1, cells):
+            goal_i, goal_j = divmod(value - 1, size)
+            for pos in range(cells):
+                i, j = divmod(pos, size)
+                self.manhattan[value, pos] = abs(goal_i - i) + abs(goal_j - j)
+                if goal_i == i:
+                    self.row_code[value, pos] = goal_j + 1
+                if goal_j == j:
+                    self.col_code[value, pos] = goal_i + 1
+
+        # nombre minimal de tuiles à sortir d'une ligne pour que les autres soient dans l'ordre
+        # (taille de la ligne moins sa plus longue sous-suite croissante), pour chaque suite de codes
+        self.powers = (size + 1) ** np.arange(size)
+        self.line_removals = np.zeros((size + 1) ** size, dtype=np.int64)
+        for codes in itertools.product(range(size + 1), repeat=size):
+            tiles = [code for code in codes if code]
+            longest = [1] * len(tiles)
+            for a in range(len(tiles)):
+                for b in range(a):
+                    if tiles[b] < tiles[a]:
+                        longest[a] = max(longest[a], longest[b] + 1)
+            key = sum(code * (size + 1) ** k for k, code in enumerate(codes))
+            self.line_removals[key] = len(tiles) - max(longest, default=0)
+
+        # case d'arrivée de la case vide pour chaque coup "UDLR", -1 si hors du plateau
+        self.neighbor = np.full((cells, 4), -1, dtype=np.int64)
+        for pos in range(cells):
+            i, j = divmod(pos, size)
+            for k, move in enumerate(MOVE_LETTERS):
+                di, dj = MOVES[move]
+                if 0 <= i + di < size and 0 <= j + dj < size:
+                    self.neighbor[pos, k] = (i + di) * size + j + dj
+
+batch_tables = {}
+
+class BatchBoards:
+    """
+    Lot de plateaux `size`x`size` dans un tableau NumPy de forme (nombre, size*size),
+    un plateau par ligne (cases lues ligne par ligne).
+    Les heuristiques et l'expansion des voisins portent sur tout le lot à la fois,
+    sans boucle Python par plateau.
+    """
+    def __init__(self, cells, size):
+        if np is None:
+            raise ImportError("Le moteur vectorisé nécessite NumPy (pip install numpy).")
+        self.size = size
+        self.cells = np.asarray(cells, dtype=np.uint8).reshape(-1, size * size)
+        if size not in batch_tables:
+            batch_tables[size] = BatchTables(size)
+        self.tables = batch_tables[size]
+
+    @classmethod
+    def from_boards(cls, boards):
+        size = len(boards[0])
+        return cls([[value for row in board for value in row] for board in boards], size)
+
+    def to_boards(self):
+        size = self.size
+        return [[list(map(int, flat[i*size:(i+1)*size])) for i in range(size)] for flat in self.cells]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def blanks(self):
+        """Position de la case vide de chaque plateau."""
+        return np.argmin(self.cells, axis=1)
+
+    def manhattan(self):
+        return self.tables.manhattan[self.cells, self.tables.positions].sum(axis=1, dtype=np.int64)
+
+    def hamming(self):
+        return ((self.cells != self.tables.goal) & (self.cells != 0)).sum(axis=1)
+
+    def linear_conflict(self):
+        """
+        Manhattan plus 2 coups par tuile à sortir de sa ligne ou colonne finale pour
+        débloquer les conflits linéaires (heuristique admissible).
+        """
+        tables = self.tables
+        size = self.size
+        count = len(self.cells)
+        row_codes = tables.row_code[self.cells, tables.positions].reshape(count, size, size)
+        col_codes = tables.col_code[self.cells, tables.positions].reshape(count, size, size).transpose(0, 2, 1)
+        row_keys = (row_codes * tables.powers).sum(axis=2)
+        col_keys = (col_codes * tables.powers).sum(axis=2)
+        removals = tables.line_removals[row_keys].sum(axis=1) + tables.line_removals[col_keys].sum(axis=1)
+        return self.manhattan() + 2 * removals
+
+    def neighbors(self):
+        """
+        Développe tous les plateaux d'un coup.
+        Retourne (voisins, indice du plateau parent, indice du coup dans "UDLR").
+        """
+        blanks = self.blanks()
+        children, parents, moves = [], [], []
+        for k in range(len(MOVE_LETTERS)):
+            targets = self.tables.neighbor[blanks, k]
+            valid = np.nonzero(targets >= 0)[0]
+            rows = np.arange(len(valid))
+            child = self.cells[valid]  # copie (indexation avancée)
+            child[rows, blanks[valid]] = child[rows, targets[valid]]
+            child[rows, targets[valid]] = 0
+            children.append(child)
+            parents.append(valid)
+            moves.append(np.full(len(valid), k, dtype=np.uint8))
+        return BatchBoards(np.concatenate(children), self.size), np.concatenate(parents), np.concatenate(moves)
+
+    def pack(self):
+        """Encode chaque plateau (4 bits par case) dans un entier uint64, pour trier et dédoublonner."""
+        keys = np.zeros(len(self.cells), dtype=np.uint64)
+        for pos in range(self.size * self.size):
+            keys = (keys << np.uint64(4)) | self.cells[:, pos].astype(np.uint64)
+        return keys
+
+    @classmethod
+    def unpack(cls, keys, size):
+        keys = np.asarray(keys, dtype=np.uint64)
+        cells = np.zeros((len(keys), size * size), dtype=np.uint8)
+        for pos in reversed(range(size * size)):
+            cells[:, pos] = (keys & np.uint64(0xF)).astype(np.uint8)
+            keys = keys >> np.uint64(4)
+        return cls(cells, size)
+
+def bfs_distance_counts(size=3, max_depth=None):
+    """
+    Parcours en largeur vectorisé depuis l'état final, couche par couche.
+    Retourne le nombre d'états à chaque distance optimale. Le graphe du taquin est biparti
+    (chaque coup change la parité de la position de la case vide) : les voisins d'une couche
+    sont dans la couche précédente ou la suivante, il suffit donc d'écarter la précédente.
+    Tout est en mémoire : adapté au 3x3 (181 440 états), pas à l'espace complet du 4x4.
+    """
+    frontier = BatchBoards.from_boards([make_goal(size)]).pack()
+    previous = np.zeros(0, dtype=np.uint64)
+    counts = [1]
+    while max_depth is None or len(counts) <= max_depth:
+        children = np.unique(BatchBoards.unpack(frontier, size).neighbors()[0].pack())
+        children = children[~np.isin(children, previous, assume_unique=True)]
+        if not len(children):
+            break
+        previous, frontier = frontier, children
+        counts.append(len(children))
+    return counts
+
+# Parcours en largeur sur disque : distribution exacte des distances du 4x4 (ou d'une partie de l'espace)
+#
+# Chaque couche est un fichier de clés uint64 (4 bits par case, voir BatchBoards.pack) triées et
+# sans doublon. La couche d+1 est obtenue en développant la couche d par blocs (un processus par
+# bloc, chaque bloc écrit un fichier trié), puis en fusionnant ces fichiers par tranches de clés et
+# en retirant la couche d-1. Les fichiers sont écrits puis renommés : un parcours interrompu reprend
+# à la dernière couche complète, sans refaire les blocs déjà écrits.
+BFS_CHUNK_STATES = 1 << 20  # états développés par bloc
+BFS_MERGE_STATES = 1 << 22  # ordre de grandeur des états chargés par tranche de fusion
+BFS_COUNTS_FILE = "profondeurs.txt"
+BFS_KEY_FORMAT = "uint64-4bits"  # format des clés des couches (BatchBoards.pack)
+
+def bfs_layer_path(directory, depth):
+    return os.path.join(directory, f"couche_{depth:03d}.bin")
+
+def bfs_run_path(directory, depth, index):
+    return os.path.join(directory, f"bloc_{depth:03d}_{index:06d}.bin")
+
+def write_keys(path, keys):
+    """Écrit des clés dans un fichier temporaire puis le renomme (écriture atomique)."""
+    tmp_path = path + ".tmp"
+    np.asarray(keys, dtype="<u8").tofile(tmp_path)
+    os.replace(tmp_path, path)
+
+def read_keys(path):
+    """Projette un fichier de clés en mémoire sans le charger."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return np.zeros(0, dtype="<u8")
+    return np.memmap(path, dtype="<u8", mode="r")
+
+def bfs_expand_chunk(task):
+    """
+    Développe les états [start, stop) de la couche `depth` et écrit leurs voisins,
+    triés et sans doublon, dans un fichier de bloc. Exécuté dans un processus de travail.
+    """
+    directory, size, depth, index, start, stop = task
+    path = bfs_run_path(directory, depth + 1, index)
+    if not os.path.exists(path):
+        keys = np.array(read_keys(bfs_layer_path(directory, depth))[start:stop])
+        children = BatchBoards.unpack(keys, size).neighbors()[0].pack()
+        write_keys(path, np.unique(children))
+    return path
+
+def bfs_merge_runs(run_paths, previous_path, output_path):
+    """
+    Fusionne des fichiers de clés triés en une couche triée sans doublon, privée des états de la
+    couche précédente. Le travail se fait par tranches de clés : dans chaque fichier trié, la
+    tranche est retrouvée par recherche dichotomique, si bien que la mémoire reste bornée.
+    `previous_path` vaut None pour la première couche ; s'il est donné, le fichier doit exister.
+    Retourne le nombre d'états de la couche.
+    """
+    if previous_path is not None and not os.path.exists(previous_path):
+        raise FileNotFoundError(f"couche précédente absente : {previous_path}")
+    runs = [read_keys(path) for path in run_paths]
+    previous = read_keys(previous_path) if previous_path is not None else np.zeros(0, dtype="<u8")
+
+    # bornes des tranches : un échantillon régulier de chaque fichier
+    stride = max(1, BFS_MERGE_STATES // 16)
+    sample = np.unique(np.concatenate([np.array(run[::stride]) for run in runs] + [np.zeros(0, dtype="<u8")]))
+    bounds = list(sample[16::16]) + [None]
+
+    tmp_path = output_path + ".tmp"
+    total = 0
+    lower = None
+    with open(tmp_path, "wb") as output:
+        for upper in bounds:
+            def window(keys):
+                start = 0 if lower is None else np.searchsorted(keys, lower)
+                stop = len(keys) if upper is None else np.searchsorted(keys, upper)
+                return np.array(keys[start:stop])
+            merged = np.unique(np.concatenate([window(run) for run in runs] + [np.zeros(0, dtype="<u8")]))
+            merged = merged[~np.isin(merged, window(previous), assume_unique=True)]
+            merged.astype("<u8").tofile(output)
+            total += len(merged)
+            lower = upper
+    os.replace(tmp_path, output_path)
+    return total
+
+def external_bfs(directory, size=4, max_depth=None, processes=None, keep_layers=False):
+    """
+    Parcours en largeur sur disque depuis l'état final ; retourne le nombre d'états par distance.
+    Les comptes sont enregistrés dans `directory`/profondeurs.txt après chaque couche.
+    Sans `keep_layers`, les couches devenues inutiles (d-2) sont supprimées au fur et à mesure.
+    Relancer avec le même dossier reprend là où le parcours s'était arrêté ; un dossier
+    d'un parcours d'une autre taille est refusé (ValueError).
+    """
+    if np is None:
+        raise ImportError("Le parcours sur disque nécessite NumPy (pip install numpy).")
+    os.makedirs(directory, exist_ok=True)
+    counts_path = os.path.join(directory, BFS_COUNTS_FILE)
+
+    # l'en-tête de profondeurs.txt empêche de reprendre un parcours d'une autre taille
+    header = f"# taille {size} clés {BFS_KEY_FORMAT}"
+    counts = []
+    if os.path.exists(counts_path):
+        with open(counts_path, encoding="utf-8") as counts_file:
+            lines = [line.strip() for line in counts_file if line.strip()]
+        if lines and lines[0] != header:
+            raise ValueError(f"{counts_path} ne correspond pas à ce parcours "
+                             f"(attendu « {header} », trouvé « {lines[0]} ») : utilisez un autre dossier.")
+        counts = [int(line.split()[1]) for line in lines[1:]]
+    # on ne reprend qu'à partir d'une couche présente sur disque avec sa précédente
+    def resumable(depth):
+        return (os.path.exists(bfs_layer_path(directory, depth))
+                and (depth == 0 or os.path.exists(bfs_layer_path(directory, depth - 1))))
+
+    while counts and not resumable(len(counts) - 1):
+        counts.pop()
+    if not counts:
+        write_keys(bfs_layer_path(directory, 0), BatchBoards.from_boards([make_goal(size)]).pack())
+        counts = [1]
+
+    def save_counts():
+        with open(counts_path + ".tmp", "w", encoding="utf-8") as counts_file:
+            counts_file.write(header + "\n")
+            for depth, count in enumerate(counts):
+                counts_file.write(f"{depth} {count}\n")
+        os.replace(counts_path + ".tmp", counts_path)
+
+    save_counts()
+    pool = multiprocessing.Pool(processes) if processes != 1 else None
+    try:
+        while counts[-1] and (max_depth is None or len(counts) <= max_depth):
+            depth = len(counts) - 1
+            layer_size = counts[-1]
+            tasks = [(directory, size, depth, index, start, min(start + BFS_CHUNK_STATES, layer_size))
+                     for index, start in enumerate(range(0, layer_size, BFS_CHUNK_STATES))]
+            if pool is not None:
+                run_paths = sorted(pool.imap_unordered(bfs_expand_chunk, tasks))
+            else:
+                run_paths = [bfs_expand_chunk(task) for task in tasks]
+
+            previous_path = bfs_layer_path(directory, depth - 1) if depth >= 1 else None
+            count = bfs_merge_runs(run_paths, previous_path, bfs_layer_path(directory, depth + 1))
+            for path in run_paths:
+                os.remove(path)
+            counts.append(count)
+            save_counts()
+            print(f"profondeur {depth + 1} : {count} états")
+            if not keep_layers and depth >= 1:
+                os.remove(bfs_layer_path(directory, depth - 1))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    if not counts[-1]:
+        counts.pop()  # dernière couche vide : parcours terminé
+    return counts
+
+# Enregistrement des parties
+#
+# Le journal est une suite de trames ajoutées au fil du jeu, plusieurs parties pouvant s'entrelacer :
+#   0x01 début  : id (varint), taille (1 octet), source (1 octet), heure de début en ms (varint),
+#                 puis les cases du plateau initial sur 4 bits chacune
+#   0x02 coups  : id, nombre de coups (varint), coups sur 2 bits (index dans "UDLR", 4 par octet),
+#                 puis le délai de chaque coup depuis le précédent en ms (varint)
+#   0x03 fin    : id, résultat (1 octet : 1 résolue, 0 non résolue)
+GAME_LOG_PATH = "parties.taq"
+MOVES_PER_FRAME = 16  # coups gardés en tampon avant écriture
+FRAME_START, FRAME_MOVES, FRAME_END = 1, 2, 3
+SOURCE_HUMAN, SOURCE_AI = 0, 1
+MOVE_LETTERS = "UDLR"
+
+def encode_varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+def read_varint(stream):
+    """
+    Lit un entier varint dans un flux binaire ; lève EOFError si le flux est tronqué.
+    """
+    value = shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            raise EOFError
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+def read_exact(stream, count):
+    data = stream.read(count)
+    if len(data) < count:
+        raise EOFError
+    return data
+
+def pack_nibbles(values):
+    values = list(values) + [0] * (len(values) % 2)
+    return bytes((values[k] << 4) | values[k + 1] for k in range(0, len(values), 2))
+
+def unpack_nibbles(data, count):
+    values = []
+    for byte in data:
+        values.extend((byte >> 4, byte & 0x0F))
+    return values[:count]
+
+def pack_moves(moves):
+    out = bytearray((len(moves) + 3) // 4)
+    for k, move in enumerate(moves):
+        out[k // 4] |= MOVE_LETTERS.index(move) << (2 * (k % 4))
+    return bytes(out)
+
+def unpack_moves(data, count):
+    return "".join(MOVE_LETTERS[(data[k // 4] >> (2 * (k % 4))) & 3] for k in range(count))
+
+def move_between(blank, cell):
+    """
+    Retourne le coup (U/D/L/R) qui amène la case vide `blank` sur la case voisine `cell`.
+    """
+    delta = (cell[0] - blank[0], cell[1] - blank[1])
+    for move, direction in MOVES.items():
+        if direction == delta:
+            return move
+    return None
+
+class GameRecording:
+    """
+    Enregistre une partie dans le journal binaire au fur et à mesure qu'elle est jouée.
+    Les coups sont écrits par paquets de MOVES_PER_FRAME, et le reste à la fin de la partie.
+    L'identifiant est tiré au hasard : plusieurs instances du jeu peuvent écrire dans le même
+    journal sans que leurs parties se mélangent.
+    Les parties encore ouvertes à la fermeture de l'application sont vidées sur disque
+    (flush_open_recordings) sans être terminées : elles sont relues comme non terminées.
+    """
+    open_recordings = set()
+
+    def __init__(self, board, source=SOURCE_HUMAN, path=None):
+        self.game_id = int.from_bytes(os.urandom(4), "big")
+        self.path = path or GAME_LOG_PATH
+        self.moves = []
+        self.delays = []
+        self.last_time = time.time()
+        self.closed = False
+
+        size = len(board)
+        cells = [value for row in board for value in row]
+        self._write(bytes([FRAME_START]) + encode_varint(self.game_id) + bytes([size, source])
+                    + encode_varint(int(self.last_time * 1000)) + pack_nibbles(cells))
+        if not self.closed:
+            GameRecording.open_recordings.add(self)
+
+    def record(self, move):
+        if self.closed:
+            return
+        now = time.time()
+        self.moves.append(move)
+        self.delays.append(int((now - self.last_time) * 1000))
+        self.last_time = now
+        if len(self.moves) >= MOVES_PER_FRAME:
+            self.flush()
+
+    def flush(self):
+        if not self.moves:
+            return
+        frame = bytearray([FRAME_MOVES])
+        frame += encode_varint(self.game_id) + encode_varint(len(self.moves)) + pack_moves(self.moves)
+        for delay in self.delays:
+            frame += encode_varint(delay)
+        self._write(bytes(frame))
+        self.moves = []
+        self.delays = []
+
+    def end(self, solved):
+        if self.closed:
+            return
+        self.flush()
+        self._write(bytes([FRAME_END]) + encode_varint(self.game_id) + bytes([1 if solved else 0]))
+        self.closed = True
+        GameRecording.open_recordings.discard(self)
+
+    def _write(self, data):
+        try:
+            with open(self.path, "ab") as log_file:
+                log_file.write(data)
+        except OSError as e:
+            print("Erreur lors de l'enregistrement de la partie :", e)
+            self.closed = True
+
+def flush_open_recordings():
+    """Écrit les coups en tampon des parties en cours (appelé à la fermeture de l'application)."""
+    for recording in list(GameRecording.open_recordings):
+        recording.flush()
+
+atexit.register(flush_open_recordings)
+
+class RecordedGame:
+    """
+    Partie relue depuis le journal : plateau initial, coups (chaîne U/D/L/R) et délais en ms.
+    `solved` vaut None si la partie n'a pas été terminée (application fermée en cours de jeu).
+    """
+    def __init__(self, game_id, board, source, start_time):
+        self.game_id = game_id
+        self.board = board
+        self.source = source
+        self.start_time = start_time
+        self.moves = ""
+        self.delays = []
+        self.solved = None
+
+def read_games(path=GAME_LOG_PATH):
+    """
+    Parcourt le journal en flux et produit chaque partie (RecordedGame) dès qu'elle est terminée.
+    Seules les parties en cours d'écriture sont gardées en mémoire, si bien que des milliers de
+    parties peuvent être analysées sans charger tout le fichier. Une trame tronquée en fin de
+    fichier est ignorée.
+    """
+    pending = {}
+    with open(path, "rb") as stream:
+        while True:
+            try:
+                tag = stream.read(1)
+                if not tag:
+                    break
+                game_id = read_varint(stream)
+                if tag[0] == FRAME_START:
+                    size, source = read_exact(stream, 2)
+                    start_time = read_varint(stream)
+                    cells = unpack_nibbles(read_exact(stream, (size*size + 1) // 2), size*size)
+                    board = [cells[i*size:(i+1)*size] for i in range(size)]
+                    if game_id in pending:
+                        # identifiant réutilisé (collision ou ancien journal) : l'ancienne partie n'a pas été terminée
+                        yield pending.pop(game_id)
+                    pending[game_id] = RecordedGame(game_id, board, source, start_time)
+                elif tag[0] == FRAME_MOVES:
+                    count = read_varint(stream)
+                    moves = unpack_moves(read_exact(stream, (count + 3) // 4), count)
+                    delays = [read_varint(stream) for _ in range(count)]
+                    if game_id in pending:
+                        pending[game_id].moves += moves
+                        pending[game_id].delays.extend(delays)
+                elif tag[0] == FRAME_END:
+                    solved = read_exact(stream, 1)[0] == 1
+                    if game_id in pending:
+                        game = pending.pop(game_id)
+                        game.solved = solved
+                        yield game
+                else:
+                    print("Journal des parties corrompu : trame inconnue", tag[0])
+                    break
+            except EOFError:
+                break
+    yield from pending.values()
+
+def optimal_length(board):
+    """
+    Longueur de la solution optimale de `board`, ou None si le solveur abandonne.
+    IDA* (conflits linéaires) si NumPy est disponible, sinon A* (Manhattan).
+    """
+    if np is not None:
+        solution = ida_star(board)
+    else:
+        solution = a_star(board, make_goal(len(board)))
+    return None if solution is None else len(solution)
+
+def compare_with_optimal(path=GAME_LOG_PATH, processes=None):
+    """
+    Pour chaque partie résolue du journal, produit (partie, coups joués, longueur optimale).
+    La longueur optimale vaut None si le solveur a atteint sa limite.
+    Chaque plateau de départ n'est résolu qu'une fois (les tournois réutilisent les mêmes
+    plateaux), et les résolutions sont réparties sur `processes` processus (par défaut : tous
+    les cœurs).
+    """
+    games = []
+    boards = {}
+    for game in read_games(path):
+        if not game.solved:
+            continue
+        # on rejoue la partie pour écarter les enregistrements incohérents
+        board = [row[:] for row in game.board]
+        for move in game.moves:
+            apply_move(board, move)
+        if board != make_goal(len(board)):
+            continue
+        games.append(game)
+        boards.setdefault(tuple(tuple(row) for row in game.board), game.board)
+
+    if processes != 1 and len(boards) > 1:
+        with multiprocessing.Pool(processes) as pool:
+            lengths = pool.map(optimal_length, boards.values(), chunksize=1)
+    else:
+        lengths = [optimal_length(board) for board in boards.values()]
+    optimal = dict(zip(boards, lengths))
 
-    return None  # aucun chemin trouvé
+    for game in games:
+        yield game, len(game.moves), optimal[tuple(tuple(row) for row in game.board)]
+
+def print_recordings_report(path=GAME_LOG_PATH, processes=None):
+    """
+    Affiche un résumé du journal : parties, parties résolues et écart moyen à la solution optimale.
+    Les parties dont l'optimum n'a pas pu être calculé sont comptées à part.
+    """
+    if not os.path.exists(path):
+        print("Aucun journal de parties :", path)
+        return
+    games = solved = compared = 0
+    played_total = optimal_total = 0
+    for game in read_games(path):
+        games += 1
+    for game, played, optimal in compare_with_optimal(path, processes):
+        solved += 1
+        if optimal is not None:
+            compared += 1
+            played_total += played
+            optimal_total += optimal
+    print(f"Parties enregistrées : {games}")
+    print(f"Parties résolues : {solved}")
+    if solved > compared:
+        print(f"Parties sans optimum calculable (limite du solveur) : {solved - compared}")
+    if compared:
+        print(f"Coups joués en moyenne : {played_total / compared:.1f}")
+        print(f"Solution optimale en moyenne : {optimal_total / compared:.1f}")
+        if played_total:
+            print(f"Efficacité : {100 * optimal_total / played_total:.1f} %")
 
 def show_congratulations():
     """
@@ -785,7 +2188,7 @@ def show_congratulations():
 
         # Redimensionner l'image source à la taille du canvas
         size = len(board_j1)
-        total_size = size * 150
+        total_size = size * tile_size
         try:
             resample_filter = Image.Resampling.LANCZOS
         except AttributeError:
@@ -807,104 +2210,905 @@ def show_congratulations():
     except Exception as e:
         print("Erreur lors de l'affichage de l'image complète :", e)
 
-def update_display():
-    size = len(board_j1)
-    puzzle_canvas.delete("all")
-    if not photos:
-        # fallback textuel si pas d'images chargées
-        for i in range(size):
-            for j in range(size):
-                value = board_j1[i][j]
-                if value != 0:
-                    puzzle_canvas.create_text(j*150+75, i*150+75, text=str(value), font=('Helvetica', 24))
-        return
-
+@profiler.timed("draw_board")
+def draw_board(canvas, board, tile_size=DEFAULT_TILE_SIZE):
+    """
+    Redessine un plateau dans un canvas avec le jeu de tuiles partagé `photos`.
+    Chaque tuile porte le tag "tuile<n>" pour pouvoir être animée seule sans tout redessiner.
+    """
+    size = len(board)
+    canvas.delete("all")
     for i in range(size):
         for j in range(size):
-            value = board_j1[i][j]
-            if value != 0:
-                if value < len(photos):
-                    try:
-                        puzzle_canvas.create_image(j*150, i*150, anchor=tk.NW, image=photos[value])
-                    except Exception:
-                        puzzle_canvas.create_text(j*150+75, i*150+75, text=str(value), font=('Helvetica', 24))
+            value = board[i][j]
+            if value == 0:
+                continue
+            if photos and value < len(photos):
+                try:
+                    canvas.create_image(j*tile_size, i*tile_size, anchor=tk.NW, image=photos[value], tags=f"tuile{value}")
+                    continue
+                except Exception:
+                    pass
+            # fallback textuel si pas d'images chargées
+            canvas.create_text(j*tile_size + tile_size//2, i*tile_size + tile_size//2, text=str(value),
+                               font=('Helvetica', max(10, tile_size // 6)), tags=f"tuile{value}")
+
+@profiler.timed("update_display")
+def update_display():
+    draw_board(puzzle_canvas, board_j1, tile_size)
 
-def update_display_j1():
-    size = len(board_j1)
-    puzzle_canvas_j1.delete("all")
-    if not photos:
-        for i in range(size):
-            for j in range(size):
-                value = board_j1[i][j]
-                if value != 0:
-                    puzzle_canvas_j1.create_text(j*150+75, i*150+75, text=str(value), font=('Helvetica', 24))
+def dpi_scale():
+    """
+    Facteur d'échelle de l'écran par rapport à un écran standard à 96 dpi.
+    """
+    try:
+        return fenetre.winfo_fpixels('1i') / 96.0
+    except Exception:
+        return 1.0
+
+def compute_tile_size(size, canvas, rows=1, cols=1, margin=44, min_tile=MIN_TILE_SIZE):
+    """
+    Calcule la taille des tuiles pour que `rows` x `cols` plateaux de `size` x `size`
+    tiennent dans la fenêtre actuelle.
+    La hauteur occupée par les autres widgets (titres, boutons) est mesurée à partir de la
+    taille demandée par la fenêtre ; `margin` est la marge horizontale autour de chaque canvas.
+    Le résultat est arrondi à 10 pixels près pour limiter le nombre de jeux de tuiles en cache,
+    et borné par `min_tile` et MAX_TILE_SIZE (à l'échelle de l'écran).
+    """
+    fenetre.update_idletasks()
+    board_px = int(canvas['width'])
+    chrome_height = fenetre.winfo_reqheight() - rows * board_px
+    available_width = fenetre.winfo_width() // cols - margin
+    available_height = (fenetre.winfo_height() - chrome_height) // rows
+    tile_px = min(available_width, available_height) // size // 10 * 10
+
+    scale = dpi_scale()
+    return int(max(min_tile * scale, min(MAX_TILE_SIZE * scale, tile_px)))
+
+def fit_solo_board_to_window():
+    """
+    Adapte la taille des tuiles du plateau solo / IA à la fenêtre et redessine.
+    """
+    global tile_size, photos
+    if puzzle_canvas is None or not puzzle_canvas.winfo_exists():
         return
+    size = len(board_j1)
+    margin = 44
+    if metrics_panel is not None:
+        margin += metrics_panel.winfo_reqwidth() + 40
+    tile_size = compute_tile_size(size, puzzle_canvas, margin=margin)
+    photos = load_image_and_create_tiles(size, tile_size)
+    puzzle_canvas.config(width=size*tile_size, height=size*tile_size)
+    if solution_player is not None:
+        solution_player.tile_size = tile_size
+    update_display()
 
-    for i in range(size):
-        for j in range(size):
-            value = board_j1[i][j]
-            if value != 0:
-                if value < len(photos):
-                    try:
-                        puzzle_canvas_j1.create_image(j*150, i*150, anchor=tk.NW, image=photos[value])
-                    except Exception:
-                        puzzle_canvas_j1.create_text(j*150+75, i*150+75, text=str(value), font=('Helvetica', 24))
-
-def update_display_j2():
-    size = len(board_j2)
-    puzzle_canvas_j2.delete("all")
-    if not photos:
-        for i in range(size):
-            for j in range(size):
-                value = board_j2[i][j]
-                if value != 0:
-                    puzzle_canvas_j2.create_text(j*150+75, i*150+75, text=str(value), font=('Helvetica', 24))
+def set_resize_handler(handler):
+    """
+    Enregistre la fonction qui adapte l'écran de jeu courant à la taille de la fenêtre et l'applique.
+    """
+    global resize_handler
+    resize_handler = handler
+    handler()
+
+def on_window_configure(event):
+    """
+    Redimensionnement de la fenêtre : le recalcul des tuiles est différé (debounce)
+    pour ne pas refaire le travail à chaque pixel pendant que l'utilisateur tire sur le bord.
+    """
+    global resize_after_id
+    if event.widget is not fenetre or resize_handler is None:
         return
+    if resize_after_id is not None:
+        fenetre.after_cancel(resize_after_id)
+    resize_after_id = fenetre.after(RESIZE_DEBOUNCE_MS, apply_window_resize)
 
-    for i in range(size):
-        for j in range(size):
-            value = board_j2[i][j]
-            if value != 0:
-                if value < len(photos):
-                    try:
-                        puzzle_canvas_j2.create_image(j*150, i*150, anchor=tk.NW, image=photos[value])
-                    except Exception:
-                        puzzle_canvas_j2.create_text(j*150+75, i*150+75, text=str(value), font=('Helvetica', 24))
+def apply_window_resize():
+    global resize_after_id
+    resize_after_id = None
+    if resize_handler is not None:
+        resize_handler()
 
-def execute_solution(solution, i=1):
+class SolutionPlayer:
+    """
+    Rejoue une suite de coups (U/D/L/R) sur un plateau en animant une seule tuile par coup.
+    Les coups peuvent être ajoutés au fur et à mesure avec `push` : la lecture commence
+    sans attendre la solution complète, qui est signalée par `finish`.
+    Toutes les méthodes doivent être appelées depuis le thread Tkinter.
+    """
+    def __init__(self, canvas, board, redraw, on_finish=None, delay=300, tile_size=DEFAULT_TILE_SIZE, on_move=None):
+        self.canvas = canvas
+        self.board = board
+        self.redraw = redraw
+        self.on_finish = on_finish
+        self.on_move = on_move  # appelé avec chaque coup effectivement joué
+        self.delay = delay
+        self.tile_size = tile_size
+        self.pending = []
+        self.finished = False
+        self.paused = False
+        self.instant = False
+        self.animating = False
+        self.stopped = False
+        self._after_id = None
+
+    def push(self, moves):
+        """Ajoute des coups à la file de lecture."""
+        self.pending.extend(moves)
+        self._schedule(0)
+
+    def finish(self):
+        """Signale qu'aucun coup ne sera plus ajouté."""
+        self.finished = True
+        self._schedule(0)
+
+    def set_delay(self, delay):
+        self.delay = delay
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        if self.paused:
+            self._cancel()  # le coup déjà programmé ne doit pas être joué
+        else:
+            self._schedule(0)
+
+    def step(self):
+        """Joue un seul coup pendant la pause."""
+        if self.paused and not self.animating:
+            self._cancel()
+            self._play_next(force=True)
+
+    def skip(self):
+        """Passe en lecture instantanée : tous les coups restants sont appliqués sans animation."""
+        self.instant = True
+        self.paused = False
+        self._schedule(0)
+
+    def stop(self):
+        self.stopped = True
+        self._cancel()
+
+    def _cancel(self):
+        if self._after_id is not None:
+            try:
+                self.canvas.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _schedule(self, delay):
+        if self.stopped or self.paused or self.animating:
+            return
+        self._cancel()
+        try:
+            self._after_id = self.canvas.after(delay, self._play_next)
+        except Exception:
+            self.stopped = True
+
+    def _play_next(self, force=False):
+        """Joue le coup suivant ; `force` permet à `step` de jouer pendant la pause."""
+        self._after_id = None
+        if self.stopped or not self.canvas.winfo_exists():
+            self.stopped = True
+            return
+        if self.paused and not force:
+            return
+
+        if self.instant:
+            while self.pending:
+                move = self.pending.pop(0)
+                if apply_move(self.board, move) is not None and self.on_move is not None:
+                    self.on_move(move)
+            self.redraw()
+        elif self.pending:
+            self._animate_move(self.pending.pop(0))
+            return
+
+        if self.finished:
+            self.stopped = True
+            if self.on_finish is not None:
+                self.on_finish()
+        # sinon, on attend que le solveur ajoute des coups (push)
+
+    def _animate_move(self, move):
+        positions = apply_move(self.board, move)
+        if positions is None:
+            # coup invalide : on resynchronise l'affichage avec le plateau
+            self.redraw()
+            self._schedule(0)
+            return
+        (start_i, start_j), (end_i, end_j) = positions
+        value = self.board[end_i][end_j]
+        if self.on_move is not None:
+            self.on_move(move)
+
+        def done():
+            self.animating = False
+            self._place_tile(value, end_i, end_j)
+            self._schedule(self.delay)
+
+        self.animating = True
+        animate_tile(self.canvas, f"tuile{value}",
+                     start_j * self.tile_size, start_i * self.tile_size,
+                     end_j * self.tile_size, end_i * self.tile_size,
+                     steps=10, delay=max(1, min(20, self.delay // 15)), on_done=done)
+
+    def _place_tile(self, value, i, j):
+        """Recale une tuile sur sa case (la taille des tuiles a pu changer pendant l'animation)."""
+        tag = f"tuile{value}"
+        offset = self.tile_size // 2 if self.canvas.type(tag) == "text" else 0
+        self.canvas.coords(tag, j*self.tile_size + offset, i*self.tile_size + offset)
+
+def execute_solution(solution):
     """
     Exécute la solution (appelée depuis le thread UI via fenetre.after).
+    `solution` est une suite de coups U/D/L/R ; la lecture est confiée à un SolutionPlayer.
     """
-    global board_j1
+    player = start_solution_playback(recording=GameRecording(board_j1, source=SOURCE_AI))
+    if player is not None:
+        player.push(solution)
+        player.finish()
+
+def start_solution_playback(on_finish=show_congratulations, recording=None):
+    """
+    Crée le lecteur de solution pour le plateau du joueur 1 et retourne-le.
+    Les solveurs qui produisent des plans partiels lui ajoutent leurs coups avec `push`.
+    Si `recording` est fourni, chaque coup joué y est enregistré.
+    """
+    global solution_player
     if not fenetre.winfo_exists():
+        return None
+    if solution_player is not None:
+        solution_player.stop()
+    update_display()
+
+    def finish():
+        if recording is not None:
+            recording.end(board_j1 == goal_state)
+        on_finish()
+
+    solution_player = SolutionPlayer(puzzle_canvas, board_j1, update_display,
+                                     on_finish=finish, delay=playback_delay,
+                                     tile_size=tile_size,
+                                     on_move=recording.record if recording is not None else None)
+    return solution_player
+
+def revoir_derniere_partie():
+    """
+    Rejoue sur le canvas la dernière partie commencée, avec les contrôles de lecture.
+    L'ordre de sortie de read_games ne convient pas : une partie non terminée n'est produite
+    qu'en fin de journal, même si elle est ancienne.
+    """
+    global mode_de_jeu, board_j1
+    last_game = None
+    try:
+        for game in read_games():
+            if last_game is None or game.start_time >= last_game.start_time:
+                last_game = game
+    except OSError:
+        pass
+    if last_game is None:
+        messagebox.showinfo("Revoir", "Aucune partie enregistrée.")
         return
 
-    if i < len(solution):
-        board_j1 = solution[i]
-        update_display()
-        fenetre.after(300, execute_solution, solution, i+1)
-    else:
+    mode_de_jeu = "revoir"
+    start_game(len(last_game.board))
+    board_j1 = [row[:] for row in last_game.board]
+    player = start_solution_playback(on_finish=fin_revoir)
+    if player is not None:
+        player.push(last_game.moves)
+        player.finish()
+
+def fin_revoir():
+    if board_j1 == goal_state:
         show_congratulations()
+    elif fenetre.winfo_exists():
+        messagebox.showinfo("Revoir", "Fin de la partie enregistrée (non résolue).")
+
+def control_playback(action):
+    """
+    Transmet une commande ("toggle_pause", "step" ou "skip") au lecteur de solution en cours.
+    """
+    if solution_player is not None:
+        getattr(solution_player, action)()
+
+def set_playback_delay(value):
+    """
+    Règle le délai entre deux coups (curseur de vitesse du mode IA).
+    """
+    global playback_delay
+    playback_delay = int(float(value))
+    if solution_player is not None:
+        solution_player.set_delay(playback_delay)
 
 def quitter_partie(joueur=None):
     """
     Fonction générique appelée lorsqu'un joueur ou l'utilisateur clique sur "Quitter".
     """
+    global current_recording
     if joueur is not None:
-        gagnant = "Joueur 2" if joueur == 1 else "Joueur 1"
         reponse = messagebox.askyesno("Confirmation", f"Joueur {joueur}, êtes-vous sûr de vouloir quitter ?")
         if reponse:
-            messagebox.showinfo("Partie terminée", f"{gagnant} remporte la partie !")
-            afficher_page_accueil()
+            gagnant = multiplayer_game.abandon(joueur)
+            if gagnant is not None:
+                messagebox.showinfo("Partie terminée", f"Joueur {gagnant} remporte la partie !")
+                afficher_page_accueil()
+            else:
+                messagebox.showinfo("Abandon", f"Joueur {joueur} abandonne, la partie continue.")
     else:
         reponse = messagebox.askyesno("Confirmation", "Êtes-vous sûr de vouloir quitter ?")
         if reponse:
+            if current_recording is not None:
+                current_recording.end(False)
+                current_recording = None
+            afficher_page_accueil()
+
+# Course contre l'IA
+#
+# La difficulté ne règle que le temps CPU de réflexion de l'IA pour chaque coup : les deux
+# adversaires jouent à la même cadence, seule la qualité des coups de l'IA change.
+# Budget par coup : (secondes CPU, nœuds minimum, nœuds maximum). Les bornes en nœuds encadrent
+# largement le débit habituel ; elles gardent les niveaux distincts si l'horloge CPU est grossière.
+RACE_BUDGETS = {"Facile": (0.0005, 5, 60), "Moyen": (0.003, 40, 400), "Difficile": (0.02, 300, 3000)}
+RACE_MOVE_DELAY = 400  # délai entre deux coups de l'IA (ms)
+RACE_PLAN_AHEAD = 2  # coups que l'IA peut décider d'avance sur l'affichage
+
+class RaceGame:
+    """
+    Course entre le joueur et l'IA sur deux plateaux mélangés à l'identique.
+    L'IA décide coup par coup (LRTA*) dans un thread, avec un budget de temps CPU par coup ;
+    ses coups sont joués à cadence fixe par un SolutionPlayer. Le thread n'a jamais plus de
+    RACE_PLAN_AHEAD coups d'avance sur l'affichage, pour ne pas disputer le GIL à l'interface.
+    """
+    def __init__(self, parent, size, difficulty):
+        self.size = size
+        self.difficulty = difficulty
+        self.budget, self.min_nodes, self.max_nodes = RACE_BUDGETS[difficulty]
+        self.player = None
+        self.recordings = None
+        self.started = False
+        self.over = False
+        self.stopped = False
+        self.credits = threading.Semaphore(RACE_PLAN_AHEAD)
+
+        self.status = Label(
+            parent,
+            text="Préparation du mélange...",
+            font=('Helvetica', 14),
+            bg=COLORS['background'],
+            fg=COLORS['text']
+        )
+        self.status.grid(row=0, column=0, columnspan=2, pady=10)
+
+        self.human = BoardView(parent, "Vous", size, self.on_click, tile_size=tile_size)
+        self.ai = BoardView(parent, f"IA ({difficulty})", size, lambda view, event: None, tile_size=tile_size)
+        self.human.frame.grid(row=1, column=0, padx=20)
+        self.ai.frame.grid(row=1, column=1, padx=20)
+        StyledButton(self.human.frame, text="Quitter", command=self.quitter).pack(pady=5)
+        self.human.redraw()
+        self.ai.redraw()
+
+        def worker():
+            boards, distance = tournament_scrambles(size, 1)
+            self.send(self.start, boards[0], distance)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def send(self, func, *args):
+        """Transmet un appel au thread Tkinter (appelé depuis les threads de travail)."""
+        try:
+            fenetre.after(0, func, *args)
+        except RuntimeError:
+            self.stopped = True  # l'interface est fermée
+
+    def start(self, board, distance):
+        if self.stopped or not self.human.canvas.winfo_exists():
+            return
+        self.human.board = [row[:] for row in board]
+        self.ai.board = [row[:] for row in board]
+        self.human.redraw()
+        self.ai.redraw()
+        self.recordings = (GameRecording(board), GameRecording(board, source=SOURCE_AI))
+        self.player = SolutionPlayer(self.ai.canvas, self.ai.board, self.ai.redraw,
+                                     on_finish=self.ai_finished, delay=RACE_MOVE_DELAY,
+                                     tile_size=self.ai.tile_size, on_move=self.ai_moved)
+        self.started = True
+        self.status['text'] = f"C'est parti ! (solution optimale : {distance} coups)"
+        threading.Thread(target=self.plan, args=([row[:] for row in board],), daemon=True).start()
+
+    def plan(self, state):
+        """Thread de l'IA : une décision LRTA* par coup, dans la limite du budget CPU."""
+        goal = make_goal(self.size)
+        learned = {}
+        while state != goal:
+            self.credits.acquire()
+            if self.stopped:
+                return
+            moves = lrta_star_step(state, goal, learned, self.budget, self.min_nodes, self.max_nodes)
+            for move in moves:
+                apply_move(state, move)
+            self.send(self.player.push, moves)
+        self.send(self.player.finish)
+
+    def ai_moved(self, move):
+        self.recordings[1].record(move)
+        self.credits.release()
+
+    def on_click(self, view, event):
+        if not self.started or self.over:
+            return
+        blank = find_blank(view.board)
+        cell = view.cell_at(event.x, event.y)
+        if not view.try_move(*cell):
+            return
+        self.recordings[0].record(move_between(blank, cell))
+        if view.board == goal_state:
+            self.end("Bravo ! Vous avez battu l'IA !")
+
+    def ai_finished(self):
+        if not self.over:
+            self.end("L'IA a terminé avant vous !")
+
+    def end(self, message):
+        self.stop()
+        if fenetre.winfo_exists():
+            messagebox.showinfo("Course terminée", message)
+        afficher_page_accueil()
+
+    def stop(self):
+        """Arrête l'IA et termine les enregistrements (idempotent)."""
+        if self.over:
+            return
+        self.over = True
+        self.stopped = True
+        self.credits.release()  # réveille le thread de l'IA pour qu'il s'arrête
+        if self.player is not None:
+            self.player.stop()
+        if self.recordings is not None:
+            for recording, view in zip(self.recordings, (self.human, self.ai)):
+                recording.end(view.board == goal_state)
+
+    def fit_to_window(self):
+        fit_views_to_window([self.human, self.ai], 1, 2)
+        if self.player is not None:
+            self.player.tile_size = self.ai.tile_size
+
+    def quitter(self):
+        if messagebox.askyesno("Confirmation", "Êtes-vous sûr de vouloir abandonner la course ?"):
+            self.stop()
+            afficher_page_accueil()
+
+def start_race_game(size, difficulty):
+    global race_game
+
+    create_title_label(fenetre, "Course contre l'IA").pack()
+
+    game_frame = tk.Frame(fenetre, bg=COLORS['background'])
+    game_frame.pack(expand=True, pady=20)
+
+    race_game = RaceGame(game_frame, size, difficulty)
+    set_resize_handler(race_game.fit_to_window)
+
+# Multijoueur en réseau
+#
+# Le serveur fait autorité sur les plateaux ; les clients n'envoient que des coups.
+# Chaque message commence par un octet de type, suivi d'une charge utile de longueur fixe :
+#   client -> serveur  JOIN   taille, nombre de joueurs
+#                      MOVE   coup (index dans "UDLR")
+#   serveur -> client  START  joueur, nombre de joueurs, taille, plateau initial sur 4 bits par case
+#                      UPDATE joueur, coup, joueur suivant
+#                      REJECT (coup refusé)
+#                      WIN    joueur
+#                      LEFT   joueur, joueur suivant
+NETWORK_PORT = 8765
+MSG_JOIN, MSG_MOVE = 0x10, 0x11
+MSG_START, MSG_UPDATE, MSG_REJECT, MSG_WIN, MSG_LEFT = 0x20, 0x21, 0x22, 0x23, 0x24
+MESSAGE_LENGTHS = {MSG_JOIN: 2, MSG_MOVE: 1, MSG_UPDATE: 3, MSG_REJECT: 0, MSG_WIN: 1, MSG_LEFT: 2}
+
+async def read_message(reader):
+    """
+    Lit un message complet ; retourne (type, charge utile).
+    Lève asyncio.IncompleteReadError si la connexion est fermée.
+    """
+    kind = (await reader.readexactly(1))[0]
+    if kind == MSG_START:
+        head = await reader.readexactly(3)
+        size = head[2]
+        return kind, head + await reader.readexactly((size*size + 1) // 2)
+    if kind not in MESSAGE_LENGTHS:
+        raise ConnectionError(f"message inconnu : {kind}")
+    return kind, await reader.readexactly(MESSAGE_LENGTHS[kind])
+
+class NetworkConnection:
+    def __init__(self, writer):
+        self.writer = writer
+        self.player = None  # numéro attribué au lancement de la partie (à partir de 0)
+
+    def send(self, data):
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+class NetworkMatch:
+    """
+    Partie en réseau : état de référence des plateaux, validation des coups et diffusion.
+    """
+    def __init__(self, size, player_count):
+        self.size = size
+        self.player_count = player_count
+        self.connections = []
+        self.boards = None
+        self.players = []
+        self.current = 0
+        self.over = False
+        self.starting = False
+        self.departed = []  # connexions perdues pendant la génération des plateaux
+
+    def broadcast(self, data):
+        # pas d'attente de drain : un client lent ne retarde pas les autres
+        for connection in self.connections:
+            connection.send(data)
+
+    async def start(self, executor=None):
+        size = self.size
+        self.starting = True
+        # la génération (A* en Python pur) tourne dans un autre processus : dans un thread, elle
+        # garderait le GIL et retarderait les diffusions des autres parties
+        loop = asyncio.get_running_loop()
+        boards, _ = await loop.run_in_executor(executor, tournament_scrambles, size, 1)
+        board = boards[0]
+        self.boards = [[row[:] for row in board] for _ in self.connections]
+        self.players = list(range(len(self.connections)))
+        cells = pack_nibbles([value for row in board for value in row])
+        for idx, connection in enumerate(self.connections):
+            connection.player = idx
+            if connection not in self.departed:
+                connection.send(bytes([MSG_START, idx, len(self.connections), size]) + cells)
+        # les joueurs partis pendant la génération abandonnent dès le départ de la partie
+        for connection in self.departed:
+            self.connections.remove(connection)
+            self.leave(connection)
+
+    def next_player(self, idx):
+        pos = self.players.index(idx)
+        return self.players[(pos + 1) % len(self.players)]
+
+    def play(self, connection, code):
+        idx = connection.player
+        if self.over or self.boards is None or idx != self.current or code >= len(MOVE_LETTERS):
+            connection.send(bytes([MSG_REJECT]))
+            return
+        if apply_move(self.boards[idx], MOVE_LETTERS[code]) is None:
+            connection.send(bytes([MSG_REJECT]))
+            return
+        if self.boards[idx] == make_goal(self.size):
+            self.over = True
+            self.broadcast(bytes([MSG_UPDATE, idx, code, idx]) + bytes([MSG_WIN, idx]))
+            return
+        self.current = self.next_player(idx)
+        self.broadcast(bytes([MSG_UPDATE, idx, code, self.current]))
+
+    def leave(self, connection):
+        if connection in self.connections and self.boards is None:
+            if self.starting:
+                self.departed.append(connection)  # traité à la fin de start()
+            else:
+                self.connections.remove(connection)  # partie pas encore lancée
+            return
+        idx = connection.player
+        if self.over or idx not in self.players:
+            return
+        if idx == self.current:
+            self.current = self.next_player(idx)
+        self.players.remove(idx)
+        self.broadcast(bytes([MSG_LEFT, idx, self.current]))
+        if len(self.players) == 1:
+            self.over = True
+            self.broadcast(bytes([MSG_WIN, self.players[0]]))
+
+class TaquinServer:
+    """
+    Serveur asyncio : regroupe les joueurs par (taille, nombre de joueurs) et héberge
+    autant de parties simultanées que nécessaire.
+    """
+    def __init__(self, executor=None):
+        self.waiting = {}
+        self.server = None
+        # exécuteur des générations de plateaux ; par défaut un pool de processus créé au besoin
+        self.executor = executor
+        self.own_executor = executor is None
+
+    async def start(self, host="localhost", port=NETWORK_PORT):
+        """Démarre l'écoute et retourne le port effectivement utilisé (utile avec port=0)."""
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle_client(self, reader, writer):
+        connection = NetworkConnection(writer)
+        match = None
+        try:
+            kind, payload = await read_message(reader)
+            size, player_count = payload if kind == MSG_JOIN else (0, 0)
+            if size not in (3, 4) or not 2 <= player_count <= 8:
+                return
+
+            key = (size, player_count)
+            match = self.waiting.get(key)
+            if match is None:
+                match = self.waiting[key] = NetworkMatch(size, player_count)
+            match.connections.append(connection)
+            if len(match.connections) == player_count:
+                del self.waiting[key]
+                if self.executor is None:
+                    # "spawn" : des processus issus de fork hériteraient des sockets des clients,
+                    # dont la fermeture ne serait alors plus vue par le serveur
+                    self.executor = concurrent.futures.ProcessPoolExecutor(
+                        mp_context=multiprocessing.get_context("spawn"))
+                await match.start(self.executor)
+
+            while True:
+                kind, payload = await read_message(reader)
+                if kind == MSG_MOVE:
+                    match.play(connection, payload[0])
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+        finally:
+            if match is not None:
+                match.leave(connection)
+                key = (match.size, match.player_count)
+                if not match.connections and self.waiting.get(key) is match:
+                    del self.waiting[key]
+            writer.close()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        if self.own_executor and self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+async def run_server(port=NETWORK_PORT, host="0.0.0.0"):
+    server = TaquinServer()
+    port = await server.start(host, port)
+    print(f"Serveur du Taquin en écoute sur le port {port}")
+    await server.server.serve_forever()
+
+class NetworkClient:
+    """
+    Client réseau : sa boucle asyncio tourne dans un thread à part pour ne jamais bloquer Tk.
+    Chaque message reçu est passé à `on_message(type, charge utile)` depuis ce thread ;
+    `on_message(None, b"")` signale la fin de la connexion.
+    Peut aussi héberger un serveur local dans la même boucle.
+    """
+    def __init__(self, on_message):
+        self.on_message = on_message
+        self.loop = asyncio.new_event_loop()
+        self.writer = None
+        self.server = None
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def host(self, port=NETWORK_PORT):
+        """Démarre un serveur local dans la boucle du client et retourne son port."""
+        self.server = TaquinServer()
+        return asyncio.run_coroutine_threadsafe(self.server.start("0.0.0.0", port), self.loop).result(timeout=5)
+
+    def connect(self, host, port, size, player_count):
+        asyncio.run_coroutine_threadsafe(self._run(host, port, size, player_count), self.loop)
+
+    async def _run(self, host, port, size, player_count):
+        try:
+            reader, self.writer = await asyncio.open_connection(host, port)
+            self.writer.write(bytes([MSG_JOIN, size, player_count]))
+            while True:
+                kind, payload = await read_message(reader)
+                self.on_message(kind, payload)
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+        self.on_message(None, b"")
+
+    def send_move(self, move):
+        if self.writer is not None:
+            self.loop.call_soon_threadsafe(self.writer.write, bytes([MSG_MOVE, MOVE_LETTERS.index(move)]))
+
+    def close(self):
+        def shutdown():
+            if self.writer is not None:
+                self.writer.close()
+            if self.server is not None:
+                self.server.close()
+            self.loop.call_later(0.1, self.loop.stop)
+        self.loop.call_soon_threadsafe(shutdown)
+
+class NetworkGame:
+    """
+    Partie en ligne côté interface : les plateaux ne changent que sur les messages du serveur.
+    Les messages arrivent du thread réseau et sont traités dans le thread Tkinter via fenetre.after.
+    """
+    def __init__(self, parent, client, size, player_count):
+        self.parent = parent
+        self.client = client
+        self.size = size
+        self.player_count = player_count
+        self.views = []
+        self.me = None
+        self.current = 0
+        self.recording = None
+        self.finished = False
+
+        self.status = Label(
+            parent,
+            text="En attente des autres joueurs...",
+            font=('Helvetica', 14),
+            bg=COLORS['background'],
+            fg=COLORS['text']
+        )
+        self.status.grid(row=0, column=0, columnspan=4, pady=10)
+
+    def receive(self, kind, payload):
+        """Appelé depuis le thread réseau."""
+        try:
+            fenetre.after(0, self.handle_message, kind, payload)
+        except RuntimeError:
+            pass  # l'interface est fermée
+
+    def handle_message(self, kind, payload):
+        if self.finished or not self.status.winfo_exists():
+            return
+        if kind == MSG_START:
+            self.me, self.player_count, size = payload[0], payload[1], payload[2]
+            cells = unpack_nibbles(payload[3:], size*size)
+            self.build([cells[i*size:(i+1)*size] for i in range(size)])
+        elif kind == MSG_UPDATE:
+            idx, code, self.current = payload
+            apply_move(self.views[idx].board, MOVE_LETTERS[code])
+            self.views[idx].redraw()
+            if idx == self.me:
+                self.recording.record(MOVE_LETTERS[code])
+            self.update_turn()
+        elif kind == MSG_LEFT:
+            idx, self.current = payload
+            self.status['text'] = f"Joueur {idx + 1} a quitté la partie."
+            self.update_turn()
+        elif kind == MSG_WIN:
+            self.finish()
+            winner = payload[0]
+            solved = self.views[winner].board == goal_state
+            if self.recording is not None:
+                self.recording.end(winner == self.me and solved)
+            if solved:
+                show_congratulations_multiplayer(self.views[winner], winner + 1)
+            else:
+                messagebox.showinfo("Partie terminée", f"Joueur {winner + 1} remporte la partie !")
+                afficher_page_accueil()
+        elif kind is None:
+            self.finish()
+            if self.recording is not None:
+                self.recording.end(False)
+            messagebox.showinfo("En ligne", "La connexion avec le serveur est perdue.")
             afficher_page_accueil()
 
+    def build(self, board):
+        columns = min(4, self.player_count)
+        self.rows = (self.player_count + columns - 1) // columns
+        self.columns = columns
+        for idx in range(self.player_count):
+            title = f"Joueur {idx + 1}" + (" (vous)" if idx == self.me else "")
+            view = BoardView(self.parent, title, self.size, self.on_click, tile_size=tile_size)
+            view.board = [row[:] for row in board]
+            view.frame.grid(row=1 + idx // columns, column=idx % columns, padx=20)
+            if idx == self.me:
+                StyledButton(view.frame, text="Quitter", command=quitter_partie_en_ligne).pack(pady=5)
+            self.views.append(view)
+            view.redraw()
+        self.recording = GameRecording(board)
+        self.update_turn()
+        set_resize_handler(lambda: fit_views_to_window(self.views, self.rows, self.columns))
+
+    def update_turn(self):
+        for idx, view in enumerate(self.views):
+            view.set_active(idx == self.current)
+        if self.current == self.me:
+            self.status['text'] = "À vous de jouer !"
+        else:
+            self.status['text'] = f"Au tour du joueur {self.current + 1}"
+
+    def on_click(self, view, event):
+        if self.me is None or view is not self.views[self.me] or self.current != self.me:
+            return
+        blank = find_blank(view.board)
+        move = move_between(blank, view.cell_at(event.x, event.y))
+        if move is not None:
+            # le plateau sera mis à jour à la réception de la confirmation du serveur
+            self.client.send_move(move)
+
+    def finish(self):
+        self.finished = True
+        self.client.close()
+
+def start_network_game(size, player_count):
+    """
+    Rejoint (ou héberge, si aucune adresse n'est donnée) une partie en ligne.
+    """
+    global network_game
+    address = simpledialog.askstring(
+        "En ligne",
+        "Adresse du serveur (hôte:port)\nLaisser vide pour héberger la partie sur cette machine :",
+        parent=fenetre
+    )
+    if address is None:
+        afficher_selection_mode()
+        return
+
+    create_title_label(fenetre, "Mode En ligne").pack()
+    game_frame = tk.Frame(fenetre, bg=COLORS['background'])
+    game_frame.pack(expand=True, pady=20)
+
+    client = NetworkClient(lambda kind, payload: network_game.receive(kind, payload))
+    network_game = NetworkGame(game_frame, client, size, player_count)
+    host, _, port = address.strip().partition(":")
+    try:
+        if not host:
+            host, port = "localhost", client.host()
+        client.connect(host, int(port or NETWORK_PORT), size, player_count)
+    except (OSError, ValueError) as e:
+        client.close()
+        messagebox.showinfo("En ligne", f"Impossible de lancer la partie en ligne : {e}")
+        afficher_page_accueil()
+
+def quitter_partie_en_ligne():
+    reponse = messagebox.askyesno("Confirmation", "Êtes-vous sûr de vouloir quitter la partie en ligne ?")
+    if reponse and network_game is not None:
+        network_game.finish()
+        if network_game.recording is not None:
+            network_game.recording.end(False)
+        afficher_page_accueil()
+
 # Lancement de l'application
-fenetre = tk.Tk()
-setup_window(fenetre, "Jeu du Taquin")
-style = ttk.Style()
-style.configure('TFrame', background=COLORS['background'])
-afficher_page_accueil()
-fenetre.mainloop()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jeu du Taquin")
+    parser.add_argument("--analyser", metavar="JOURNAL", nargs="?", const=GAME_LOG_PATH,
+                        help="affiche les statistiques des parties enregistrées et quitte")
+    parser.add_argument("--serveur", metavar="PORT", nargs="?", type=int, const=NETWORK_PORT,
+                        help="lance uniquement le serveur du mode En ligne")
+    parser.add_argument("--profil", metavar="OPTIONS", nargs="?", const="1",
+                        default=os.environ.get("TAQUIN_PROFIL"),
+                        help="active le profilage (1, cprofile, tracemalloc, séparés par des virgules) ; "
+                             "équivaut à la variable d'environnement TAQUIN_PROFIL")
+    parser.add_argument("--bfs", metavar="DOSSIER",
+                        help="parcours en largeur sur disque (reprend s'il a été interrompu), puis quitte")
+    parser.add_argument("--taille", type=int, choices=(3, 4), default=4, help="taille du puzzle pour --bfs")
+    parser.add_argument("--profondeur", type=int, help="profondeur maximale pour --bfs")
+    parser.add_argument("--processus", type=int, help="nombre de processus pour --bfs et --analyser (par défaut : tous les cœurs)")
+    parser.add_argument("--garder-couches", action="store_true", help="conserve tous les fichiers de couches de --bfs")
+    args = parser.parse_args()
+
+    if args.bfs:
+        try:
+            counts = external_bfs(args.bfs, args.taille, args.profondeur, args.processus, args.garder_couches)
+        except ValueError as e:
+            print("Erreur :", e)
+            sys.exit(1)
+        for depth, count in enumerate(counts):
+            print(f"{depth:3d} {count}")
+        print(f"total : {sum(counts)} états")
+        sys.exit()
+    if args.profil and args.profil.strip().lower() not in ("0", "false"):
+        profiler.enable(args.profil)
+
+    if args.analyser:
+        print_recordings_report(args.analyser, args.processus)
+        sys.exit()
+    if args.serveur is not None:
+        try:
+            asyncio.run(run_server(args.serveur))
+        except KeyboardInterrupt:
+            pass
+        sys.exit()
+
+    fenetre = tk.Tk()
+    setup_window(fenetre, "Jeu du Taquin")
+    fenetre.bind("<Configure>", on_window_configure)
+    style = ttk.Style()
+    style.configure('TFrame', background=COLORS['background'])
+    afficher_page_accueil()
+    profiler.start_lag_monitor(fenetre)
+    fenetre.mainloop()
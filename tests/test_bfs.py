@@ -0,0 +1,62 @@
+"""
+Tests du parcours en largeur sur disque (external_bfs) contre le parcours en mémoire du 3x3.
+Les blocs et les tranches de fusion sont réduits pour exercer le découpage sur un petit espace.
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import taquin
+
+
+@unittest.skipIf(taquin.np is None, "NumPy n'est pas installé")
+class TestParcoursSurDisque(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.expected = taquin.bfs_distance_counts(3)
+
+    def setUp(self):
+        self.saved = taquin.BFS_CHUNK_STATES, taquin.BFS_MERGE_STATES
+        taquin.BFS_CHUNK_STATES = 5000
+        taquin.BFS_MERGE_STATES = 20000
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        taquin.BFS_CHUNK_STATES, taquin.BFS_MERGE_STATES = self.saved
+        self.tmp.cleanup()
+
+    def test_parcours_complet(self):
+        counts = taquin.external_bfs(self.directory, 3, processes=1)
+        self.assertEqual(counts, self.expected)
+        self.assertEqual(sum(counts), 181440)
+
+    def test_reprise_apres_interruption(self):
+        partial = taquin.external_bfs(self.directory, 3, max_depth=12, processes=1)
+        self.assertEqual(partial, self.expected[:13])
+        # interruption au milieu de la couche suivante : un bloc écrit, pas de fusion
+        taquin.bfs_expand_chunk((self.directory, 3, 12, 0, 0, min(taquin.BFS_CHUNK_STATES, partial[12])))
+        counts = taquin.external_bfs(self.directory, 3, processes=2)
+        self.assertEqual(counts, self.expected)
+
+    def test_reprise_sans_couche_precedente(self):
+        taquin.external_bfs(self.directory, 3, max_depth=12, processes=1)
+        os.remove(taquin.bfs_layer_path(self.directory, 11))
+        counts = taquin.external_bfs(self.directory, 3, processes=1)
+        self.assertEqual(counts, self.expected)
+
+    def test_taille_differente_refusee(self):
+        taquin.external_bfs(self.directory, 3, max_depth=5, processes=1)
+        with self.assertRaises(ValueError):
+            taquin.external_bfs(self.directory, 4, processes=1)
+
+    def test_fusion_sans_couche_precedente(self):
+        with self.assertRaises(FileNotFoundError):
+            taquin.bfs_merge_runs([], os.path.join(self.directory, "absente.bin"),
+                                  os.path.join(self.directory, "sortie.bin"))
+
+
+if __name__ == "__main__":
+    unittest.main()
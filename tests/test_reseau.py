@@ -0,0 +1,118 @@
+"""
+Tests du mode En ligne sur localhost : serveur sur un port libre, vrais clients TCP.
+"""
+import asyncio
+import concurrent.futures
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import taquin
+
+
+async def join(port, size=3, player_count=2):
+    reader, writer = await asyncio.open_connection("localhost", port)
+    writer.write(bytes([taquin.MSG_JOIN, size, player_count]))
+    await writer.drain()
+    return reader, writer
+
+
+async def receive(reader):
+    return await asyncio.wait_for(taquin.read_message(reader), timeout=5)
+
+
+def start_board(payload):
+    size = payload[2]
+    cells = taquin.unpack_nibbles(payload[3:], size*size)
+    return [cells[i*size:(i+1)*size] for i in range(size)]
+
+
+def valid_move(board):
+    """Un coup légal qui ne résout pas le plateau."""
+    for code, letter in enumerate(taquin.MOVE_LETTERS):
+        state = [row[:] for row in board]
+        if taquin.apply_move(state, letter) is not None and state != taquin.make_goal(len(board)):
+            return code
+
+
+class TestReseau(unittest.IsolatedAsyncioTestCase):
+    executor = None  # pool de processus par défaut
+
+    async def asyncSetUp(self):
+        self.server = taquin.TaquinServer(self.executor)
+        self.port = await self.server.start("localhost", 0)
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.server.wait_closed()
+
+    async def test_partie_a_deux(self):
+        reader1, writer1 = await join(self.port)
+        reader2, writer2 = await join(self.port)
+
+        kind, payload1 = await receive(reader1)
+        self.assertEqual(kind, taquin.MSG_START)
+        kind, payload2 = await receive(reader2)
+        self.assertEqual(kind, taquin.MSG_START)
+        self.assertEqual({payload1[0], payload2[0]}, {0, 1})
+        self.assertEqual(start_board(payload1), start_board(payload2))
+
+        # le joueur 0 commence
+        first, other = (reader1, writer1), (reader2, writer2)
+        if payload1[0] != 0:
+            first, other = other, first
+        code = valid_move(start_board(payload1))
+        first[1].write(bytes([taquin.MSG_MOVE, code]))
+        for reader in (first[0], other[0]):
+            self.assertEqual(await receive(reader), (taquin.MSG_UPDATE, bytes([0, code, 1])))
+
+        # coup hors tour : refusé, seul l'auteur est prévenu
+        first[1].write(bytes([taquin.MSG_MOVE, code]))
+        self.assertEqual(await receive(first[0]), (taquin.MSG_REJECT, b""))
+
+        # déconnexion du joueur 1 : le joueur 0 gagne par abandon
+        other[1].close()
+        self.assertEqual(await receive(first[0]), (taquin.MSG_LEFT, bytes([1, 0])))
+        self.assertEqual(await receive(first[0]), (taquin.MSG_WIN, bytes([0])))
+        first[1].close()
+
+
+class TestGenerationLente(TestReseau):
+    """Génération ralentie dans un thread (un pool de processus ne verrait pas la substitution)."""
+    def setUp(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor()
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    test_partie_a_deux = None
+
+    async def test_deconnexion_pendant_la_generation(self):
+        generate_scrambles = taquin.generate_scrambles
+
+        def slow_generate(*args):
+            time.sleep(0.3)
+            return generate_scrambles(*args)
+
+        taquin.generate_scrambles = slow_generate
+        try:
+            reader1, writer1 = await join(self.port)
+            reader2, writer2 = await join(self.port)
+            await asyncio.sleep(0.1)
+            writer1.close()  # le premier arrivé part pendant que le second lance la partie
+
+            kind, payload = await receive(reader2)
+            self.assertEqual(kind, taquin.MSG_START)
+            self.assertEqual(payload[1], 2)
+            me = payload[0]
+            self.assertEqual((await receive(reader2))[0], taquin.MSG_LEFT)
+            self.assertEqual(await receive(reader2), (taquin.MSG_WIN, bytes([me])))
+            writer2.close()
+        finally:
+            taquin.generate_scrambles = generate_scrambles
+
+
+if __name__ == "__main__":
+    unittest.main()